@@ -0,0 +1,425 @@
+#!/bin/bash
+###############################################################################
+# Hermetic Benchmark for ralph-feature.sh
+#
+# Runs the full 9-phase loop (interview → wrap-up) on synthetic features in a
+# throwaway repo, with stub `claude`, `gh` and `agent-browser` executables
+# first in PATH. Nothing touches the network or the real CLIs, so the numbers
+# can be re-run offline on any Linux box and compared against a baseline.
+#
+# Each feature gets:
+# - a plan with N tasks (backend + frontend, so Verify runs); the last feature
+#   plans from the shipped _template/tasks.md and design.md instead
+# - two Verify tests writing large console/network logs with planted secrets
+#   (filter-all throughput)
+# - a memory index over M synthetic past features (prompt retrieval cost)
+# - a PR that stays OPEN for BENCH_PR_POLLS gh queries before it is merged, so
+#   Merge waits (backoff) and polls like it would on GitHub
+#
+# The features run one at a time, then BENCH_ALL more (default: as many) run
+# in one `--all` scheduler run, in parallel worktrees.
+#
+# Reported from the loop's own timing records (.git/ralph/timings/): wall time per
+# feature, time per kind of step (claude/git/gh/memory/filter/test/wait/phase),
+# loop overhead (wall time minus model calls), filter throughput, features per
+# minute one at a time and under --all, and PR polling counts.
+#
+# Usage:
+#   bash .memory-system/scripts/bench-ralph-loop.sh [features] [artifact_mb] [tasks] [past_features]
+#   bash .memory-system/scripts/bench-ralph-loop.sh 3 16 8 200
+#
+# BENCH_CLAUDE_MS adds simulated model latency to every stub claude call
+# (default: 0, so the report is pure loop overhead). BENCH_PR_POLLS (default 2)
+# sets how many polls a PR stays open; BENCH_ALL=0 skips the --all run.
+# BENCH_KEEP=1 keeps the work directory for inspection.
+###############################################################################
+
+set -e
+
+FEATURES="${1:-3}"
+ARTIFACT_MB="${2:-8}"
+TASKS="${3:-6}"
+PAST_FEATURES="${4:-50}"
+CLAUDE_MS="${BENCH_CLAUDE_MS:-0}"
+PR_POLLS="${BENCH_PR_POLLS:-2}"
+ALL_FEATURES="${BENCH_ALL:-$FEATURES}"
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+
+# Color codes for output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+NC='\033[0m' # No Color
+
+WORK_DIR=$(mktemp -d "${TMPDIR:-/tmp}/ralph-bench-loop.XXXXXX")
+if [ "${BENCH_KEEP:-0}" = "1" ]; then
+  trap 'echo "  work dir kept: $WORK_DIR"' EXIT
+else
+  trap 'rm -rf "$WORK_DIR"' EXIT
+fi
+
+STUBS="$WORK_DIR/stubs"
+PROJECT="$WORK_DIR/project"
+
+# Hermetic git: no user/system config, fixed identity
+export GIT_CONFIG_GLOBAL=/dev/null
+export GIT_CONFIG_NOSYSTEM=1
+export GIT_AUTHOR_NAME="Ralph Bench" GIT_AUTHOR_EMAIL="bench@example.com"
+export GIT_COMMITTER_NAME="Ralph Bench" GIT_COMMITTER_EMAIL="bench@example.com"
+
+###############################################################################
+# Stub executables
+###############################################################################
+
+write_stubs() {
+  mkdir -p "$STUBS"
+
+  # claude: does what each phase prompt asks, just enough for phase detection
+  cat > "$STUBS/claude" <<'EOF'
+#!/bin/bash
+prompt="$2"
+[ "${BENCH_CLAUDE_MS:-0}" -gt 0 ] && sleep "$(awk -v ms="$BENCH_CLAUDE_MS" 'BEGIN { print ms / 1000 }')"
+
+feature=$(echo "$prompt" | grep -o 'FEAT-[0-9]*-[a-z0-9-]*' | head -1)
+dir="docs/features/$feature"
+mark() { sed -i "s/^| $1 | [^|]*|/| $1 | ✅ Complete |/" "$dir/status.md"; }
+
+case "$prompt" in
+  *"INTERVIEW phase"*)
+    sed -i 's/_TBD_/Decided (bench)/g' "$dir/spec.md"
+    mark Interview
+    echo "INTERVIEW_COMPLETE"
+    ;;
+  *"THINK CRITICALLY phase"*)
+    printf '# Analysis\n\n## 1. Problem Clarification\nBench.\n\n## 11. Decision Summary\nConfidence Level: High\n' > "$dir/analysis.md"
+    echo "ANALYSIS_COMPLETE"
+    ;;
+  *"PLAN phase"*)
+    if [ "$feature" = "$BENCH_TEMPLATE_FEATURE" ]; then
+      # The shipped templates as-is: Pre-Implementation checklist, 15 tasks,
+      # (depends: ...) markers and the Task Dependencies table
+      cp docs/features/_template/design.md docs/features/_template/tasks.md "$dir/"
+    else
+      printf '# Design\n\n## Overview\nSynthetic design.\n' > "$dir/design.md"
+      {
+        echo "# Tasks"
+        echo ""
+        echo "## Backend Tasks"
+        for i in $(seq 1 "$BENCH_TASKS"); do
+          if [ $((i % 2)) -eq 1 ]; then
+            echo "- [ ] **B$(( (i + 1) / 2 ))**: Backend step $i"
+          else
+            echo "- [ ] **F$(( i / 2 ))**: Frontend step $i"
+          fi
+        done
+      } > "$dir/tasks.md"
+    fi
+    mark Plan
+    echo "<phase>PLAN_COMPLETE</phase>"
+    ;;
+  *"of the IMPLEMENT phase"*)
+    task=$(echo "$prompt" | sed -n 's/^Task \([A-Z][0-9]*\):.*/\1/p' | head -1)
+    mkdir -p "src/$feature"
+    case "$task" in
+      F*) echo "export const $task = () => null;" > "src/$feature/$task.tsx" ;;
+      *) echo "def $task(): pass" > "src/$feature/$task.py" ;;
+    esac
+    git add src >/dev/null && git commit -q -m "$feature: $task" >/dev/null
+    echo "<task>TASK_COMPLETE</task>"
+    ;;
+  *"IMPLEMENT phase"*)
+    echo "<phase>IMPLEMENT_COMPLETE</phase>"
+    ;;
+  *"WRAP-UP phase"*)
+    mkdir -p "$dir/context"
+    printf '# Wrap-Up\n\n## Lessons Learned\nSynthetic lesson.\n\nWrap-Up Complete\n' > "$dir/context/wrap_up.md"
+    mark Wrap-Up
+    echo "<phase>WRAPUP_COMPLETE</phase>"
+    echo "<phase>FEATURE_COMPLETE</phase>"
+    ;;
+  *)
+    echo "stub claude: unknown prompt" >&2
+    exit 1
+    ;;
+esac
+EOF
+
+  # gh: PRs are recorded per branch and stay OPEN for BENCH_PR_POLLS queries,
+  # then are reported merged (auto-approve)
+  cat > "$STUBS/gh" <<'EOF'
+#!/bin/bash
+prs="$BENCH_GH_STATE"
+branch=$(git branch --show-current 2>/dev/null)
+
+# Every pr list/view is one poll: answer from the current counts, then
+# count every open PR down
+poll() {
+  : > "$prs.out"
+  awk -F'\t' -v OFS='\t' -v out="$prs.out" '
+    { print $1, ($2 > 0 ? "OPEN" : "MERGED") > out; print $1, ($2 > 0 ? $2 - 1 : 0) }' \
+    "$prs" > "$prs.new" && mv "$prs.new" "$prs"
+}
+
+# Loops run concurrently under --all
+exec 9>> "$prs.lock"
+flock 9
+touch "$prs"
+
+case "$1 $2" in
+  "pr create") printf '%s\t%s\n' "$branch" "${BENCH_PR_POLLS:-0}" >> "$prs"; echo "https://example.invalid/pr/1" ;;
+  "pr list") poll; cat "$prs.out" ;;
+  "pr view")
+    poll
+    state=$(awk -F'\t' -v b="$branch" '$1 == b { print $2 }' "$prs.out")
+    [ -n "$state" ] || exit 1
+    echo "{\"state\":\"$state\"}"
+    ;;
+  *) exit 0 ;;
+esac
+EOF
+
+  # agent-browser: every command succeeds instantly
+  cat > "$STUBS/agent-browser" <<'EOF'
+#!/bin/bash
+exit 0
+EOF
+
+  chmod +x "$STUBS/claude" "$STUBS/gh" "$STUBS/agent-browser"
+}
+
+###############################################################################
+# Synthetic project
+###############################################################################
+
+# Verify test that drives the (stub) browser and leaves ~$ARTIFACT_MB MB of
+# console and network logs with one planted secret every 40 lines
+write_bench_test() {
+  cat > "$1" <<EOF
+#!/bin/bash
+set -e
+agent-browser --session "\$SESSION" open "\$BASE_URL" >/dev/null
+mkdir -p "\$RESULTS_DIR"
+awk -v bytes=$((ARTIFACT_MB * 1024 * 1024 / 2)) 'BEGIN {
+  while (size < bytes) {
+    if (n % 40 == 39) line = sprintf("[%08d] console.log: api_key=abcdefghijklmnopqrstuvwxyz0123", n)
+    else line = sprintf("[%08d] console.log: GET /api/items?page=%d status=200", n, n % 97)
+    print line
+    size += length(line) + 1; n++
+  }
+}' > "\$RESULTS_DIR/console-logs.txt"
+sed 's/^/{"url": "http:\/\/localhost\/api", "log": "/; s/\$/"}/' "\$RESULTS_DIR/console-logs.txt" > "\$RESULTS_DIR/network-logs.json"
+EOF
+}
+
+# Pending feature $1 with its _index.md row and two Verify tests
+add_feature() {
+  local id=$1
+  local dir="docs/features/$id"
+  mkdir -p "$dir/context" "$dir/tests"
+  cp docs/features/_template/spec.md docs/features/_template/status.md "$dir/"
+  write_bench_test "$dir/tests/bench-a.sh"
+  write_bench_test "$dir/tests/bench-b.sh"
+  cat > "$dir/tests/test-config.json" <<EOF
+{
+  "feature_id": "$id",
+  "tests": [
+    { "name": "bench-a", "script": "./bench-a.sh", "timeout": 120000, "required": true },
+    { "name": "bench-b", "script": "./bench-b.sh", "timeout": 120000, "required": true }
+  ],
+  "options": { "retry_on_failure": false, "max_parallel": 2 }
+}
+EOF
+  echo "| $id | Bench feature ${id##*-} | ⚪ Pending | - | - | P1 | - |" >> docs/features/_index.md
+}
+
+create_project() {
+  mkdir -p "$PROJECT"
+  git init -q --bare "$WORK_DIR/origin.git"
+  git -C "$WORK_DIR/origin.git" symbolic-ref HEAD refs/heads/main
+
+  cd "$PROJECT"
+  git init -q -b main
+  git remote add origin "$WORK_DIR/origin.git"
+
+  cp "$REPO_ROOT/ralph-feature.sh" .
+  mkdir -p .memory-system
+  cp -R "$REPO_ROOT/.memory-system/scripts" "$REPO_ROOT/.memory-system/git-hooks" .memory-system/
+  cp .memory-system/git-hooks/pre-commit .git/hooks/pre-commit
+  chmod +x .git/hooks/pre-commit
+
+  mkdir -p docs/features
+  cp -R "$REPO_ROOT/docs/features/_template" docs/features/
+  {
+    echo "# Features Dashboard"
+    echo ""
+    echo "| ID | Feature | Status | Phase | Progress | Priority | Updated |"
+    echo "|----|---------|--------|-------|----------|----------|---------|"
+  } > docs/features/_index.md
+
+  # Past features for the memory index
+  local i
+  for i in $(seq 1 "$PAST_FEATURES"); do
+    local past="docs/features/FEAT-$((900 + i))-past$i"
+    mkdir -p "$past/context"
+    printf '# Past %s\n\n## Problem\nInvoice export %s with pagination, caching and rate limiting.\n\n## Technical Decisions\n| 1 | Data | Store | postgres | - |\n' "$i" "$i" > "$past/spec.md"
+    printf '# Decisions\n\n## Caching\nUse redis with a %ss TTL for list endpoints.\n' "$i" > "$past/context/decisions.md"
+    printf '# Wrap-Up\n\n## Lessons Learned\nLesson %s: batch database writes and paginate exports.\n\nWrap-Up Complete\n' "$i" > "$past/context/wrap_up.md"
+  done
+
+  for i in $(seq 1 "$FEATURES"); do
+    add_feature "FEAT-$(printf '%03d' "$i")-bench$i"
+  done
+
+  # Keep the multi-MB synthetic artifacts out of commits
+  printf 'test-results/\n' > .gitignore
+
+  git add -A >/dev/null
+  git commit -q -m "Bench project" >/dev/null 2>&1
+  git push -q origin main >/dev/null 2>&1
+}
+
+###############################################################################
+# Run
+###############################################################################
+
+now_ms() {
+  echo $(( ${EPOCHREALTIME//[!0-9]/} / 1000 ))
+}
+
+echo -e "${YELLOW}[BENCH] ralph-feature.sh full loop (stub claude/gh/agent-browser)${NC}"
+echo "  features: $FEATURES + $ALL_FEATURES with --all, tasks: $TASKS, artifacts: ${ARTIFACT_MB} MB/test x 2, past features: $PAST_FEATURES, claude latency: ${CLAUDE_MS}ms, PR open for: $PR_POLLS polls"
+echo ""
+
+write_stubs
+create_project
+
+export PATH="$STUBS:$PATH"
+export BENCH_TASKS="$TASKS" BENCH_CLAUDE_MS="$CLAUDE_MS" BENCH_GH_STATE="$WORK_DIR/gh-prs.tsv"
+export BENCH_TEMPLATE_FEATURE="FEAT-$(printf '%03d' "$FEATURES")-bench$FEATURES"
+export BENCH_PR_POLLS="$PR_POLLS"
+export RALPH_ITERATION_PAUSE=0 RALPH_WAIT_MIN=1 RALPH_WAIT_MAX=2 RALPH_PR_CACHE_TTL=1
+
+WALL_FILE="$WORK_DIR/wall.tsv"
+: > "$WALL_FILE"
+
+for i in $(seq 1 "$FEATURES"); do
+  id="FEAT-$(printf '%03d' "$i")-bench$i"
+  git checkout -q main
+
+  START=$(now_ms)
+  RC=0
+  bash ./ralph-feature.sh "$id" 40 > "$WORK_DIR/$id.log" 2>&1 || RC=$?
+  END=$(now_ms)
+
+  if [ $RC -ne 0 ] || ! grep -q "Feature $id is complete" "$WORK_DIR/$id.log"; then
+    echo -e "${RED}[BENCH] ❌ $id did not complete (exit $RC), last lines:${NC}"
+    tail -15 "$WORK_DIR/$id.log"
+    exit 1
+  fi
+
+  printf '%s\t%s\n' "$id" "$((END - START))" >> "$WALL_FILE"
+  # Merged: the next feature starts from a main that includes this one
+  git checkout -q main && git merge -q --ff-only "feat/FEAT-$(printf '%03d' "$i")" >/dev/null
+done
+
+# One --all run: loops in parallel worktrees sharing the claude slots and
+# the batched `gh pr list`
+ALL_WALL=0
+if [ "$ALL_FEATURES" -gt 0 ]; then
+  # The features above are done; the scheduler only picks up the new ones
+  sed -i '/^| FEAT-0/s/⚪ Pending/🟢 Complete/' docs/features/_index.md
+  for i in $(seq 1 "$ALL_FEATURES"); do
+    add_feature "FEAT-$((100 + i))-all$i"
+  done
+  git add -A docs >/dev/null
+  git commit -q -m "Bench features for --all" >/dev/null 2>&1
+  git push -q origin main >/dev/null 2>&1
+
+  START=$(now_ms)
+  RC=0
+  RALPH_SCHEDULER_POLL=1 bash ./ralph-feature.sh --all "$ALL_FEATURES" 40 > "$WORK_DIR/all.log" 2>&1 || RC=$?
+  ALL_WALL=$(( $(now_ms) - START ))
+
+  for i in $(seq 1 "$ALL_FEATURES"); do
+    id="FEAT-$((100 + i))-all$i"
+    if [ $RC -ne 0 ] || ! grep -q "Feature $id is complete" ".git/ralph/logs/$id.log" 2>/dev/null; then
+      echo -e "${RED}[BENCH] ❌ --all did not complete $id (exit $RC), last lines:${NC}"
+      tail -15 ".git/ralph/logs/$id.log" 2>/dev/null || tail -15 "$WORK_DIR/all.log"
+      exit 1
+    fi
+    # Wall time of a scheduled loop: first to last timing record
+    awk -F'\t' -v id="$id" '
+      NR == 1 || $1 - $6 < first { first = $1 - $6 }
+      $1 > last { last = $1 }
+      END { printf "%s\t%d\n", id, last - first }' ".git/ralph/timings/$id.tsv" >> "$WALL_FILE"
+  done
+fi
+
+###############################################################################
+# Report
+###############################################################################
+
+TIMINGS=$(ls .git/ralph/timings/FEAT-[01]*.tsv)
+# Features whose Verify was skipped have no test-results
+shopt -s nullglob
+RESULTS=(docs/features/FEAT-0*/test-results "$WORK_DIR"/project-FEAT-*-loop/docs/features/FEAT-1*/test-results)
+shopt -u nullglob
+
+echo "Per feature:"
+awk -F'\t' '
+  FNR == NR { wall[$1] = $2; order[++n] = $1; next }
+  {
+    np = split(FILENAME, part, "/"); id = part[np]; sub(/\.tsv$/, "", id)
+    if ($4 == "iteration") iters[id]++
+    if ($4 == "claude") claude[id] += $6
+  }
+  END {
+    for (i = 1; i <= n; i++) {
+      id = order[i]
+      printf "  %-18s %8d ms wall  %3d iterations  %8d ms overhead\n", id, wall[id], iters[id], wall[id] - claude[id]
+    }
+  }' "$WALL_FILE" $TIMINGS
+
+echo ""
+echo "Per kind of step (all features):"
+printf "  %-10s %7s %10s %9s %9s\n" "kind" "count" "total ms" "mean ms" "max ms"
+awk -F'\t' '
+  { count[$4]++; total[$4] += $6; if ($6 > max[$4]) max[$4] = $6 }
+  END {
+    for (k in count)
+      printf "  %-10s %7d %10d %9.1f %9d\n", k, count[k], total[k], total[k] / count[k], max[k]
+  }' $TIMINGS | sort -k1,1
+
+echo ""
+echo "Per phase (all features):"
+awk -F'\t' '$4 == "phase" { count[$5]++; total[$5] += $6 }
+  END { for (p in count) printf "  %-10s %5d runs %10d ms\n", p, count[p], total[p] }' $TIMINGS | sort
+
+FILTER_MS=$(awk -F'\t' '$4 == "filter" { t += $6 } END { print t + 0 }' $TIMINGS)
+ARTIFACT_BYTES=0
+[ ${#RESULTS[@]} -eq 0 ] || ARTIFACT_BYTES=$(du -cb "${RESULTS[@]}" | tail -1 | cut -f1)
+TOTAL_WALL=$(awk -F'\t' '$1 ~ /^FEAT-0/ { t += $2 } END { print t }' "$WALL_FILE")
+
+echo ""
+awk -v bytes="$ARTIFACT_BYTES" -v ms="$FILTER_MS" -v wall="$TOTAL_WALL" -v n="$FEATURES" \
+    -v all_wall="$ALL_WALL" -v all_n="$ALL_FEATURES" 'BEGIN {
+  printf "  filter-all throughput  %8.1f MB/s (%.1f MB in %d ms)\n", (bytes / 1048576) / (ms > 0 ? ms / 1000 : 1e-9), bytes / 1048576, ms
+  printf "  loop throughput        %8.2f features/min (%d ms wall, one at a time)\n", n * 60000 / wall, wall
+  if (all_n > 0)
+    printf "  --all throughput       %8.2f features/min (%d ms wall, %d in parallel)\n", all_n * 60000 / all_wall, all_wall, all_n
+}'
+awk -F'\t' '
+  $4 == "gh" && $5 == "pr list" { list++ }
+  $4 == "gh" && $5 == "pr view" { view++ }
+  $4 == "wait" { waits++; wait_ms += $6 }
+  END { printf "  PR polling             %d gh pr list, %d gh pr view, %d waits (%d ms)\n", list, view, waits, wait_ms }' $TIMINGS
+
+if [ ${#RESULTS[@]} -gt 0 ] && grep -rqE 'api_key=abcdefghij' "${RESULTS[@]}"; then
+  echo -e "${RED}[BENCH] ❌ Unredacted secrets left in test-results${NC}"
+  exit 1
+fi
+
+echo ""
+echo -e "${GREEN}[BENCH] ✅ $((FEATURES + ALL_FEATURES)) features completed all phases${NC}"
@@ -0,0 +1,348 @@
+#!/bin/bash
+###############################################################################
+# Memory Index for Ralph Loop
+#
+# Local keyword index over past features' spec.md, context/decisions.md and
+# context/wrap_up.md, used to add the few relevant lessons to a phase prompt
+# instead of whole documents.
+#
+# - Only completed features are indexed (wrap_up.md says "Wrap-Up Complete",
+#   or the feature is 🟢 in _index.md): the docs of features not started yet
+#   are template copies. Sections left identical to _template/ are skipped.
+# - Documents are split into sections (markdown headings); each section is a
+#   snippet with its own term postings.
+# - The index is updated incrementally: only files whose mtime/size changed
+#   since the last update are re-read, removed files are dropped.
+# - A query returns the top-k snippets (BM25 scoring) that fit in a token
+#   budget (~4 characters per token), and prints what it returned on stderr.
+#
+# The index lives in the worktree's git dir ($(git rev-parse --git-dir)/
+# ralph-memory), so each worktree keeps its own copy in sync with its tree.
+#
+# Usage:
+#   bash .memory-system/scripts/memory-index.sh update [features_dir]
+#   bash .memory-system/scripts/memory-index.sh query "<text>" [k] [budget_tokens] [exclude_feature]
+#   bash .memory-system/scripts/memory-index.sh stats
+###############################################################################
+
+set -e
+
+# Paths are indexed relative to the repo root, wherever this is run from
+cd "$(git rev-parse --show-toplevel 2>/dev/null || pwd)"
+
+INDEX_DIR="${MEMORY_INDEX_DIR:-$(git rev-parse --git-dir 2>/dev/null || echo .git)/ralph-memory}"
+FEATURES_DIR="${MEMORY_FEATURES_DIR:-docs/features}"
+
+FILES_DB="$INDEX_DIR/files.tsv"       # path, mtime, size
+CHUNKS_DB="$INDEX_DIR/chunks.tsv"     # key, feature, doc, heading, tokens, text
+POSTINGS_DB="$INDEX_DIR/postings.tsv" # term, key, tf
+
+# Color codes for output
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+NC='\033[0m' # No Color
+
+###############################################################################
+# Locking
+###############################################################################
+
+# Run "$@" holding the index lock (exclusive for update, shared for query)
+with_index_lock() {
+  local MODE="$1"
+  shift
+  mkdir -p "$INDEX_DIR"
+
+  if command -v flock >/dev/null 2>&1; then
+    (
+      flock "$MODE" 8
+      "$@"
+    ) 8>> "$INDEX_DIR/lock"
+  else
+    "$@"
+  fi
+}
+
+###############################################################################
+# Indexing
+###############################################################################
+
+# Folder names of completed features, one per line
+completed_features() {
+  grep -lE 'Wrap-Up Complete|Wrap-up completado' "$FEATURES_DIR"/*/context/wrap_up.md 2>/dev/null | \
+    awk -F/ '{ print $(NF - 2) }'
+  # _index.md may list the short ID (FEAT-001) of folder FEAT-001-name
+  if [ -f "$FEATURES_DIR/_index.md" ]; then
+    grep -E '^\|\s*FEAT-' "$FEATURES_DIR/_index.md" | grep "🟢" | awk -F'|' '{ gsub(/ /, "", $2); print $2 }' | \
+      while IFS= read -r ID; do
+        find "$FEATURES_DIR" -mindepth 1 -maxdepth 1 -type d \( -name "$ID" -o -name "$ID-*" \) -printf '%f\n'
+      done
+  fi
+}
+
+# Current indexable files as "path<TAB>mtime<TAB>size"
+list_sources() {
+  [ -d "$FEATURES_DIR" ] || return 0
+
+  find "$FEATURES_DIR" -mindepth 2 -maxdepth 3 -type f \
+    \( -path "*/spec.md" -o -path "*/context/decisions.md" -o -path "*/context/wrap_up.md" \) \
+    -not -path "*/_template/*" -printf '%p\t%T@\t%s\n' 2>/dev/null | \
+    awk -F'\t' '
+      FNR == NR { done[$0] = 1; next }
+      {
+        n = split($1, part, "/")
+        feature = (part[n - 1] == "context") ? part[n - 2] : part[n - 1]
+        if (feature in done) print
+      }' <(completed_features) - | sort
+}
+
+# Split markdown files into sections; append chunk and posting rows
+index_files() {
+  # From FEATURES_DIR as set by the command line, not the default
+  local TEMPLATE_DIR="$FEATURES_DIR/_template"
+  local TEMPLATES="$TEMPLATE_DIR/spec.md $TEMPLATE_DIR/context/decisions.md $TEMPLATE_DIR/context/wrap-up.md"
+
+  awk -v chunks="$1" -v postings="$2" -v templates="$TEMPLATES" '
+    BEGIN {
+      split("the and for with that this from are was were will have has not but " \
+            "you your our can all any use used using into when then than also " \
+            "los las del que una por con para como sus mas este esta tbd todo", sw, " ")
+      for (i in sw) stop[sw[i]] = 1
+
+      # Sections of the templates, to skip the ones copied unchanged
+      nt = split(templates, tfile, " ")
+      for (i = 1; i <= nt; i++) {
+        heading = ""; body = ""
+        while ((getline line < tfile[i]) > 0) {
+          if (line ~ /^#+ /) {
+            template[heading SUBSEP trim(body)] = 1
+            heading = line; sub(/^#+ +/, "", heading); gsub(/\t/, " ", heading)
+            body = ""
+          } else {
+            gsub(/\t/, " ", line)
+            body = body line "\037"
+          }
+        }
+        template[heading SUBSEP trim(body)] = 1
+        close(tfile[i])
+      }
+      heading = ""; body = ""
+    }
+
+    function trim(text) {
+      gsub(/^[\037 ]+|[\037 ]+$/, "", text)
+      return text
+    }
+
+    function flush(   text, tokens, n, i, w, words, tf) {
+      text = trim(body)
+      # Skip empty sections and ones still holding template text
+      if (length(text) < 40 || text ~ /^_\[[^]]*\]_$/ || ((heading SUBSEP text) in template)) { body = ""; return }
+
+      seq++
+      key = file "#" seq
+      tokens = int((length(heading) + length(text)) / 4) + 1
+      print key "\t" feature "\t" doc "\t" heading "\t" tokens "\t" text >> chunks
+
+      n = split(tolower(heading " " text), words, /[^a-z0-9_]+/)
+      for (i = 1; i <= n; i++) {
+        w = words[i]
+        if (length(w) < 3 || (w in stop) || w ~ /^[0-9]+$/) continue
+        tf[w]++
+      }
+      for (w in tf) print w "\t" key "\t" tf[w] >> postings
+      body = ""
+    }
+
+    # FILENAME already names the next file here, so flush the last section
+    # of the previous one first
+    FNR == 1 {
+      if (NR > 1) flush()
+      file = FILENAME
+      n = split(file, part, "/")
+      doc = part[n]
+      feature = (part[n - 1] == "context") ? part[n - 2] : part[n - 1]
+      heading = doc; seq = 0; body = ""
+    }
+
+    /^#+ / {
+      flush()
+      heading = $0
+      sub(/^#+ +/, "", heading)
+      gsub(/\t/, " ", heading)
+      next
+    }
+
+    {
+      line = $0
+      gsub(/\t/, " ", line)
+      body = body line "\037"
+      # Long sections become several snippets
+      if (length(body) > 3000) { flush(); if (heading !~ / \(cont\.\)$/) heading = heading " (cont.)" }
+    }
+
+    END { if (NR > 0) flush() }' "${@:3}"
+}
+
+do_update() {
+  mkdir -p "$INDEX_DIR"
+  touch "$FILES_DB" "$CHUNKS_DB" "$POSTINGS_DB"
+
+  local CURRENT="$INDEX_DIR/files.tsv.new"
+  list_sources > "$CURRENT"
+
+  # Paths that are new, changed (mtime/size) or gone
+  local STALE="$INDEX_DIR/stale.tmp"
+  awk -F'\t' '
+    FNR == NR { old[$1] = $2 "\t" $3; next }
+    { seen[$1] = 1; if (old[$1] != $2 "\t" $3) print $1 }
+    END { for (p in old) if (!(p in seen)) print p }' "$FILES_DB" "$CURRENT" > "$STALE"
+
+  local COUNT=$(wc -l < "$STALE" | tr -d ' ')
+  if [ "$COUNT" -eq 0 ]; then
+    rm -f "$CURRENT" "$STALE"
+    echo "Index up to date ($(wc -l < "$FILES_DB" | tr -d ' ') files)"
+    return 0
+  fi
+
+  # Drop rows of stale files, then re-index the ones that still exist
+  local DB
+  for DB in "$CHUNKS_DB" "$POSTINGS_DB"; do
+    awk -F'\t' -v col=$([ "$DB" = "$CHUNKS_DB" ] && echo 1 || echo 2) '
+      FNR == NR { stale[$0] = 1; next }
+      { path = $col; sub(/#[0-9]+$/, "", path); if (!(path in stale)) print }' \
+      "$STALE" "$DB" > "$DB.new"
+  done
+
+  local CHANGED=()
+  local FILE
+  while IFS= read -r FILE; do
+    [ -f "$FILE" ] && CHANGED+=("$FILE")
+  done < "$STALE"
+
+  if [ ${#CHANGED[@]} -gt 0 ]; then
+    index_files "$CHUNKS_DB.new" "$POSTINGS_DB.new" "${CHANGED[@]}"
+  fi
+
+  mv "$CHUNKS_DB.new" "$CHUNKS_DB"
+  mv "$POSTINGS_DB.new" "$POSTINGS_DB"
+  mv "$CURRENT" "$FILES_DB"
+  rm -f "$STALE"
+
+  echo "Indexed $COUNT changed file(s), $(wc -l < "$CHUNKS_DB" | tr -d ' ') snippets total"
+}
+
+###############################################################################
+# Retrieval
+###############################################################################
+
+# Top-k snippets for $1 within $3 tokens, skipping feature $4.
+# Snippets go to stdout; a one-line summary of what was returned to stderr.
+do_query() {
+  local QUERY="$1"
+  local K="${2:-5}"
+  local BUDGET="${3:-1500}"
+  local EXCLUDE="${4:-}"
+
+  if [ ! -s "$CHUNKS_DB" ]; then
+    echo "0 snippets, 0/$BUDGET tokens" >&2
+    return 0
+  fi
+
+  awk -F'\t' -v q="$QUERY" -v k="$K" -v budget="$BUDGET" -v exclude="$EXCLUDE" \
+      -v N="$(wc -l < "$CHUNKS_DB")" -v postings="$POSTINGS_DB" '
+    BEGIN {
+      n = split(tolower(q), words, /[^a-z0-9_]+/)
+      for (i = 1; i <= n; i++) if (length(words[i]) >= 3) want[words[i]] = 1
+
+      while ((getline line < postings) > 0) {
+        split(line, f, "\t")
+        if (!(f[1] in want)) continue
+        if (exclude != "" && index(f[2], "/" exclude "/")) continue
+        df[f[1]]++
+        hits++; hterm[hits] = f[1]; hkey[hits] = f[2]; htf[hits] = f[3]
+      }
+
+      for (i = 1; i <= hits; i++) {
+        idf = log(1 + (N - df[hterm[i]] + 0.5) / (df[hterm[i]] + 0.5))
+        score[hkey[i]] += idf * htf[i] * 2.2 / (htf[i] + 1.2)
+      }
+
+      # Top-k by repeated max (k is small)
+      for (r = 1; r <= k; r++) {
+        best = ""
+        for (key in score) if (!(key in rank) && (best == "" || score[key] > score[best])) best = key
+        if (best == "") break
+        rank[best] = r; picked = r
+      }
+    }
+
+    ($1 in rank) { row[rank[$1]] = $0 }
+
+    END {
+      used = 0; count = 0; keys = ""
+      for (r = 1; r <= picked; r++) {
+        split(row[r], c, "\t")
+        header = "### " c[2] " / " c[3] " - " c[4]
+        text = c[6]
+        # c[5] covers the heading and text; add the "### feature / doc - " prefix
+        cost = c[5] + int((length(header) - length(c[4])) / 4) + 2
+        if (used + cost > budget) {
+          # Truncate the snippet to what is left of the budget
+          room = (budget - used - int(length(header) / 4) - 2) * 4
+          if (room < 160) continue
+          text = substr(text, 1, room) " ..."
+          cost = budget - used
+        }
+        gsub(/\037/, "\n", text)
+        printf "%s\n%s\n\n", header, text
+        used += cost; count++
+        keys = keys (keys == "" ? "" : ", ") c[2] "/" c[3] "#" c[4]
+      }
+      printf "%d snippets, %d/%d tokens%s\n", count, used, budget, (keys == "" ? "" : ": " keys) > "/dev/stderr"
+    }' "$CHUNKS_DB"
+}
+
+do_stats() {
+  if [ ! -s "$FILES_DB" ]; then
+    echo -e "${YELLOW}[MEMORY] Index is empty - run: update${NC}"
+    return 0
+  fi
+
+  echo -e "${GREEN}[MEMORY] $INDEX_DIR${NC}"
+  echo "  files:    $(wc -l < "$FILES_DB" | tr -d ' ')"
+  echo "  snippets: $(wc -l < "$CHUNKS_DB" | tr -d ' ')"
+  echo "  terms:    $(cut -f1 "$POSTINGS_DB" | sort -u | wc -l | tr -d ' ')"
+  echo "  tokens:   $(awk -F'\t' '{ t += $5 } END { print t + 0 }' "$CHUNKS_DB")"
+}
+
+###############################################################################
+# Main
+###############################################################################
+
+case "${1:-}" in
+  update)
+    [ -n "${2:-}" ] && FEATURES_DIR="$2"
+    with_index_lock -x do_update
+    ;;
+  query)
+    if [ -z "${2:-}" ]; then
+      echo "Usage: $0 query \"<text>\" [k] [budget_tokens] [exclude_feature]" >&2
+      exit 1
+    fi
+    # Cheap when nothing changed: one find + one awk over files.tsv
+    with_index_lock -x do_update >/dev/null
+    with_index_lock -s do_query "$2" "${3:-5}" "${4:-1500}" "${5:-}"
+    ;;
+  stats)
+    do_stats
+    ;;
+  *)
+    echo "Usage: $0 {update|query|stats}"
+    echo ""
+    echo "Commands:"
+    echo "  update [features_dir]                          - Re-index changed spec/decisions/wrap_up files"
+    echo "  query \"<text>\" [k] [budget] [exclude_feature]  - Top-k snippets within a token budget"
+    echo "  stats                                          - Show index size"
+    exit 1
+    ;;
+esac
@@ -11,6 +11,8 @@
 
 set -e
 
+SCRIPT_PATH="${BASH_SOURCE[0]}"
+
 # Color codes for output
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -75,7 +77,7 @@ scan_text_for_secrets() {
 
   # Check all pattern arrays
   for pattern in "${API_KEY_PATTERNS[@]}"; do
-    if echo "$TEXT" | grep -qiE "$pattern"; then
+    if echo "$TEXT" | grep -qiE -e "$pattern"; then
       echo -e "${RED}[SECURITY] API key pattern detected in $SOURCE${NC}"
       echo "  Pattern: $pattern"
       FOUND=1
@@ -83,7 +85,7 @@ scan_text_for_secrets() {
   done
 
   for pattern in "${TOKEN_PATTERNS[@]}"; do
-    if echo "$TEXT" | grep -qiE "$pattern"; then
+    if echo "$TEXT" | grep -qiE -e "$pattern"; then
       echo -e "${RED}[SECURITY] Token pattern detected in $SOURCE${NC}"
       echo "  Pattern: $pattern"
       FOUND=1
@@ -91,7 +93,7 @@ scan_text_for_secrets() {
   done
 
   for pattern in "${PASSWORD_PATTERNS[@]}"; do
-    if echo "$TEXT" | grep -qiE "$pattern"; then
+    if echo "$TEXT" | grep -qiE -e "$pattern"; then
       echo -e "${RED}[SECURITY] Password pattern detected in $SOURCE${NC}"
       echo "  Pattern: $pattern"
       FOUND=1
@@ -99,7 +101,7 @@ scan_text_for_secrets() {
   done
 
   for pattern in "${AWS_PATTERNS[@]}"; do
-    if echo "$TEXT" | grep -qE "$pattern"; then
+    if echo "$TEXT" | grep -qE -e "$pattern"; then
       echo -e "${RED}[SECURITY] AWS credential detected in $SOURCE${NC}"
       echo "  Pattern: $pattern"
       FOUND=1
@@ -107,7 +109,7 @@ scan_text_for_secrets() {
   done
 
   for pattern in "${KEY_PATTERNS[@]}"; do
-    if echo "$TEXT" | grep -qE "$pattern"; then
+    if echo "$TEXT" | grep -qE -e "$pattern"; then
       echo -e "${RED}[SECURITY] Private key detected in $SOURCE${NC}"
       echo "  Pattern: $pattern"
       FOUND=1
@@ -115,14 +117,110 @@ scan_text_for_secrets() {
   done
 
   for pattern in "${DB_PATTERNS[@]}"; do
-    if echo "$TEXT" | grep -qE "$pattern"; then
+    if echo "$TEXT" | grep -qE -e "$pattern"; then
       echo -e "${RED}[SECURITY] Database URL with credentials detected in $SOURCE${NC}"
       echo "  Pattern: $pattern"
       FOUND=1
     fi
   done
 
-  return $FOUND
+  # Callers read success as "secrets found"
+  [ $FOUND -eq 1 ]
+}
+
+###############################################################################
+# REDACTION ENGINE
+#
+# Every pattern family is compiled into one sed script, so a file is streamed
+# once, line by line, with all patterns applied in the same pass. Memory stays
+# flat regardless of file size (no file contents in shell variables).
+###############################################################################
+
+# Workers spawned by filter-all / scan-staged inherit the parent's rules
+REDACT_WORK_DIR="${REDACT_WORK_DIR:-}"
+
+emit_sed_rules() {
+  local MARKER="$1"
+  local FLAGS="$2"
+  shift 2
+
+  # '#' never appears in the patterns (unlike '/', used by the DB URLs)
+  local pattern
+  for pattern in "$@"; do
+    printf 's#%s#[%s]#%s\n' "$pattern" "$MARKER" "$FLAGS"
+  done
+}
+
+build_redaction_rules() {
+  # Inherited rules are only used when all of them are actually there
+  if [ -n "$REDACT_WORK_DIR" ] && [ -s "$REDACT_WORK_DIR/network.sed" ] && \
+      [ -s "$REDACT_WORK_DIR/console.sed" ] && [ -s "$REDACT_WORK_DIR/secrets-nocase.grep" ] && \
+      [ -s "$REDACT_WORK_DIR/secrets-case.grep" ]; then
+    return 0
+  fi
+
+  REDACT_WORK_DIR=$(mktemp -d "${TMPDIR:-/tmp}/ralph-redact.XXXXXX")
+  trap 'rm -rf "$REDACT_WORK_DIR"' EXIT
+
+  # Network logs: API keys, tokens, passwords
+  {
+    emit_sed_rules REDACTED-API-KEY gI "${API_KEY_PATTERNS[@]}"
+    emit_sed_rules REDACTED-TOKEN gI "${TOKEN_PATTERNS[@]}"
+    emit_sed_rules REDACTED-PASSWORD gI "${PASSWORD_PATTERNS[@]}"
+  } > "$REDACT_WORK_DIR/network.sed"
+
+  # Console logs (and other text artifacts): network rules + AWS + DB URLs
+  {
+    cat "$REDACT_WORK_DIR/network.sed"
+    emit_sed_rules REDACTED-AWS g "${AWS_PATTERNS[@]}"
+    emit_sed_rules REDACTED-DB-URL g "${DB_PATTERNS[@]}"
+  } > "$REDACT_WORK_DIR/console.sed"
+
+  # Residual check, same case rules as scan_text_for_secrets
+  printf '%s\n' "${API_KEY_PATTERNS[@]}" "${TOKEN_PATTERNS[@]}" "${PASSWORD_PATTERNS[@]}" \
+    > "$REDACT_WORK_DIR/secrets-nocase.grep"
+  printf '%s\n' "${AWS_PATTERNS[@]}" "${KEY_PATTERNS[@]}" "${DB_PATTERNS[@]}" \
+    > "$REDACT_WORK_DIR/secrets-case.grep"
+}
+
+file_contains_secrets() {
+  # Returns 0 if secrets are found, 1 if the file is clean, 2 if it could
+  # not be scanned (grep error): callers must not read 2 as clean
+  local FILE="$1"
+  local RC=0
+
+  grep -qaiE -f "$REDACT_WORK_DIR/secrets-nocase.grep" "$FILE" || RC=$?
+  [ $RC -eq 0 ] && return 0
+  [ $RC -eq 1 ] || return 2
+
+  RC=0
+  grep -qaE -f "$REDACT_WORK_DIR/secrets-case.grep" "$FILE" || RC=$?
+  [ $RC -le 1 ] && return $RC
+  return 2
+}
+
+redact_stream() {
+  # Stream INPUT through the KIND rules into TMP, print the marker count.
+  # Fails if any stage failed: TMP is then incomplete and must not be used.
+  local INPUT_FILE="$1"
+  local TMP_FILE="$2"
+  local KIND="$3"
+
+  sed -E -f "$REDACT_WORK_DIR/$KIND.sed" "$INPUT_FILE" | \
+    tee "$TMP_FILE" | \
+    { grep -o '\[REDACTED-[^]]*\]' || [ $? -eq 1 ]; } | \
+    wc -l
+  local STATUS=("${PIPESTATUS[@]}")
+
+  local RC
+  for RC in "${STATUS[@]}"; do
+    [ "$RC" -eq 0 ] || return 1
+  done
+  return 0
+}
+
+default_jobs() {
+  nproc 2>/dev/null || getconf _NPROCESSORS_ONLN 2>/dev/null || echo 4
 }
 
 ###############################################################################
@@ -140,43 +238,39 @@ filter_console_logs() {
 
   echo -e "${YELLOW}[SECURITY] Filtering console logs: $INPUT_FILE${NC}"
 
-  # Read and filter
-  local CONTENT=$(cat "$INPUT_FILE")
-
-  # Apply filters (replace with [REDACTED])
-  for pattern in "${API_KEY_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-API-KEY]/gi")
-  done
-
-  for pattern in "${TOKEN_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-TOKEN]/gi")
-  done
-
-  for pattern in "${PASSWORD_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-PASSWORD]/gi")
-  done
-
-  for pattern in "${AWS_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-AWS]/g")
-  done
-
-  for pattern in "${DB_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-DB-URL]/g")
-  done
+  build_redaction_rules
+  local TMP_FILE="$OUTPUT_FILE.tmp.$$"
+  local REDACTED
+  if ! REDACTED=$(redact_stream "$INPUT_FILE" "$TMP_FILE" console); then
+    rm -f "$TMP_FILE"
+    echo -e "${RED}[SECURITY] ❌ Filtering failed, $INPUT_FILE left unchanged${NC}"
+    return 1
+  fi
 
   # Check if any secrets remain
-  if scan_text_for_secrets "$CONTENT" "$INPUT_FILE"; then
+  local RC=0
+  file_contains_secrets "$TMP_FILE" || RC=$?
+  if [ $RC -eq 0 ]; then
+    scan_text_for_secrets "$(cat "$TMP_FILE")" "$INPUT_FILE" || true
+    rm -f "$TMP_FILE"
     echo -e "${RED}[SECURITY] ⚠️  Secrets still detected after filtering!${NC}"
     echo -e "${RED}[SECURITY] Manual review required before git commit${NC}"
     return 1
+  elif [ $RC -ne 1 ]; then
+    rm -f "$TMP_FILE"
+    echo -e "${RED}[SECURITY] ❌ Could not check filtered output, $INPUT_FILE left unchanged${NC}"
+    return 1
   fi
 
-  # Write filtered output
-  echo "$CONTENT" > "$OUTPUT_FILE"
+  # Write filtered output (only now that the whole pass succeeded)
+  if ! mv "$TMP_FILE" "$OUTPUT_FILE"; then
+    rm -f "$TMP_FILE"
+    echo -e "${RED}[SECURITY] ❌ Could not write $OUTPUT_FILE${NC}"
+    return 1
+  fi
   echo -e "${GREEN}[SECURITY] ✅ Console logs filtered: $OUTPUT_FILE${NC}"
 
   # Show redaction count
-  local REDACTED=$(echo "$CONTENT" | grep -o '\[REDACTED-[^]]*\]' | wc -l)
   echo -e "${YELLOW}[SECURITY] Redacted $REDACTED secrets${NC}"
 
   return 0
@@ -197,27 +291,36 @@ filter_network_logs() {
 
   echo -e "${YELLOW}[SECURITY] Filtering network logs: $INPUT_FILE${NC}"
 
-  # Read and filter
-  local CONTENT=$(cat "$INPUT_FILE")
+  build_redaction_rules
+  local TMP_FILE="$OUTPUT_FILE.tmp.$$"
+  if ! redact_stream "$INPUT_FILE" "$TMP_FILE" network >/dev/null; then
+    rm -f "$TMP_FILE"
+    echo -e "${RED}[SECURITY] ❌ Filtering failed, $INPUT_FILE left unchanged${NC}"
+    return 1
+  fi
 
-  # Apply filters
-  for pattern in "${API_KEY_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-API-KEY]/gi")
-  done
+  # Write filtered output (only now that the whole pass succeeded)
+  if ! mv "$TMP_FILE" "$OUTPUT_FILE"; then
+    rm -f "$TMP_FILE"
+    echo -e "${RED}[SECURITY] ❌ Could not write $OUTPUT_FILE${NC}"
+    return 1
+  fi
+  echo -e "${GREEN}[SECURITY] ✅ Network logs filtered: $OUTPUT_FILE${NC}"
 
-  for pattern in "${TOKEN_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-TOKEN]/gi")
-  done
+  return 0
+}
 
-  for pattern in "${PASSWORD_PATTERNS[@]}"; do
-    CONTENT=$(echo "$CONTENT" | sed -E "s/$pattern/[REDACTED-PASSWORD]/gi")
-  done
+###############################################################################
+# FUNCTION: Filter one test artifact in place (rules picked by file name)
+###############################################################################
 
-  # Write filtered output
-  echo "$CONTENT" > "$OUTPUT_FILE"
-  echo -e "${GREEN}[SECURITY] ✅ Network logs filtered: $OUTPUT_FILE${NC}"
+filter_file() {
+  local FILE="$1"
 
-  return 0
+  case "$(basename "$FILE")" in
+    *network*.json|*.har) filter_network_logs "$FILE" "$FILE" ;;
+    *) filter_console_logs "$FILE" "$FILE" ;;
+  esac
 }
 
 ###############################################################################
@@ -318,29 +421,183 @@ pre_commit_hook() {
   return 0
 }
 
+###############################################################################
+# FUNCTION: Scan staged blobs (batch pre-commit check)
+#
+# Reads the staged content of every matching path straight from the index in
+# one `git checkout-index` call, skips blobs that already passed with the
+# current patterns (cache keyed by blob hash), and scans the rest in parallel,
+# a batch of files per worker process.
+###############################################################################
+
+scan_timed() {
+  # Worker: scan checked-out blobs, print "PASS|FAIL|ERROR<TAB>ms<TAB>path"
+  # for each one
+  local PREFIX="$1"
+  shift
+
+  build_redaction_rules
+
+  local FILE START RC RESULT
+  for FILE in "$@"; do
+    START=${EPOCHREALTIME//[!0-9]/}
+    RC=0
+    file_contains_secrets "$FILE" || RC=$?
+    case $RC in
+      0) RESULT="FAIL" ;;
+      1) RESULT="PASS" ;;
+      *) RESULT="ERROR" ;;
+    esac
+    printf '%s\t%d\t%s\n' "$RESULT" $(( (${EPOCHREALTIME//[!0-9]/} - START) / 1000 )) "${FILE#$PREFIX/}"
+  done
+}
+
+scan_staged() {
+  local PATH_REGEX="${1:-.}"
+  local JOBS="${2:-$(default_jobs)}"
+
+  build_redaction_rules
+  export REDACT_WORK_DIR
+
+  local STATE_DIR="$(cd "$(git rev-parse --git-common-dir)" && pwd)/ralph"
+  local CACHE_FILE="$STATE_DIR/scan-cache"
+  local TIMINGS_FILE="$STATE_DIR/scan-timings.tsv"
+  mkdir -p "$STATE_DIR"
+  touch "$CACHE_FILE"
+
+  # Cached verdicts are only valid for the pattern set that produced them
+  local RULES_HASH=$(cat "$REDACT_WORK_DIR"/*.grep | cksum | cut -d' ' -f1)
+
+  # Staged paths with their index blob hashes (-z raw: meta NUL path [NUL path])
+  local BLOB_DIR="$REDACT_WORK_DIR/staged"
+  local TODO_LIST="$REDACT_WORK_DIR/staged.list"
+  local BLOB_MAP="$REDACT_WORK_DIR/staged.map"
+  mkdir -p "$BLOB_DIR"
+  : > "$TODO_LIST"
+  : > "$BLOB_MAP"
+
+  local -A CLEAN=()
+  local entry
+  mapfile -t CACHE_ENTRIES < "$CACHE_FILE"
+  for entry in "${CACHE_ENTRIES[@]}"; do
+    CLEAN[$entry]=1
+  done
+
+  local TOTAL=0
+  local CACHED=0
+  local meta sha status path
+  while IFS= read -r -d '' meta; do
+    read -r _ _ _ sha status <<< "$meta"
+    IFS= read -r -d '' path
+    case "$status" in
+      R*|C*) IFS= read -r -d '' path ;;
+    esac
+
+    [[ "$path" =~ $PATH_REGEX ]] || continue
+    TOTAL=$((TOTAL + 1))
+
+    if [ -n "${CLEAN["$RULES_HASH $sha"]:-}" ]; then
+      CACHED=$((CACHED + 1))
+      continue
+    fi
+
+    printf '%s\0' "$path" >> "$TODO_LIST"
+    printf '%s\t%s\n' "$sha" "$path" >> "$BLOB_MAP"
+  done < <(git diff --cached --raw -z --no-abbrev --diff-filter=ACMR)
+
+  echo -e "${YELLOW}[SECURITY] Staged files: $TOTAL ($CACHED unchanged since last clean scan)${NC}"
+
+  if [ $((TOTAL - CACHED)) -eq 0 ]; then
+    echo -e "${GREEN}[SECURITY] ✅ Nothing new to scan${NC}"
+    return 0
+  fi
+
+  # One pass over the index for all remaining blobs
+  git checkout-index -z --stdin --prefix="$BLOB_DIR/" < "$TODO_LIST"
+
+  # Spread the files over the workers, at most 64 per process
+  local TODO=$((TOTAL - CACHED))
+  local BATCH=$(( (TODO + JOBS - 1) / JOBS ))
+  [ $BATCH -gt 64 ] && BATCH=64
+
+  local START=$(date +%s%N)
+  find "$BLOB_DIR" -type f -print0 | \
+    xargs -0 -r -n "$BATCH" -P "$JOBS" bash "$SCRIPT_PATH" scan-timed "$BLOB_DIR" | \
+    sort -t$'\t' -k2,2nr > "$TIMINGS_FILE"
+  local END=$(date +%s%N)
+
+  local FAILED=0
+  local result ms file
+  while IFS=$'\t' read -r result ms file; do
+    case "$result" in
+      FAIL)
+        FAILED=$((FAILED + 1))
+        scan_text_for_secrets "$(tr -d '\000' < "$BLOB_DIR/$file")" "$file" || true
+        echo -e "${RED}[SECURITY] ❌ Secrets detected in: $file${NC}"
+        ;;
+      PASS)
+        # Remember clean blobs so unchanged artifacts are never rescanned
+        sha=$(awk -F'\t' -v f="$file" '$2 == f { print $1; exit }' "$BLOB_MAP")
+        [ -n "$sha" ] && echo "$RULES_HASH $sha" >> "$CACHE_FILE"
+        ;;
+      *)
+        FAILED=$((FAILED + 1))
+        echo -e "${RED}[SECURITY] ❌ Could not scan: $file${NC}"
+        ;;
+    esac
+  done < "$TIMINGS_FILE"
+
+  # A worker that died took its files' verdicts with it
+  local SCANNED=$(wc -l < "$TIMINGS_FILE")
+  if [ "$SCANNED" -lt "$TODO" ]; then
+    FAILED=$((FAILED + TODO - SCANNED))
+    echo -e "${RED}[SECURITY] ❌ $((TODO - SCANNED)) staged files were not scanned${NC}"
+  fi
+
+  # Keep the cache bounded
+  if [ $(wc -l < "$CACHE_FILE") -gt 20000 ]; then
+    tail -n 10000 "$CACHE_FILE" > "$CACHE_FILE.tmp" && mv "$CACHE_FILE.tmp" "$CACHE_FILE"
+  fi
+
+  echo -e "${YELLOW}[SECURITY] Scanned $((TOTAL - CACHED)) blobs in $(( (END - START) / 1000000 )) ms ($JOBS parallel jobs). Slowest:${NC}"
+  head -n 10 "$TIMINGS_FILE" | awk -F'\t' '{ printf "  %6d ms  %s\n", $2, $3 }'
+  echo -e "${YELLOW}[SECURITY] All timings: $TIMINGS_FILE${NC}"
+
+  if [ $FAILED -gt 0 ]; then
+    echo -e "${RED}[SECURITY] ❌ $FAILED staged files contain secrets or could not be scanned${NC}"
+    return 1
+  fi
+
+  echo -e "${GREEN}[SECURITY] ✅ No secrets detected in staged files${NC}"
+  return 0
+}
+
 ###############################################################################
 # FUNCTION: Filter all files in directory
 ###############################################################################
 
 filter_all_directory() {
   local DIR="$1"
+  local JOBS="${2:-$(default_jobs)}"
 
   if [ ! -d "$DIR" ]; then
     echo -e "${RED}[ERROR] Directory not found: $DIR${NC}"
     return 1
   fi
 
-  echo -e "${YELLOW}[SECURITY] Filtering all files in: $DIR${NC}"
+  echo -e "${YELLOW}[SECURITY] Filtering all files in: $DIR ($JOBS parallel jobs)${NC}"
 
-  # Filter console logs
-  while IFS= read -r file; do
-    filter_console_logs "$file" "$file"
-  done < <(find "$DIR" -name "console-logs.txt" -type f 2>/dev/null)
+  build_redaction_rules
+  export REDACT_WORK_DIR
 
-  # Filter network logs
-  while IFS= read -r file; do
-    filter_network_logs "$file" "$file"
-  done < <(find "$DIR" -name "network-logs.json" -type f 2>/dev/null)
+  # Every text artifact in the tree, one worker process per file
+  if ! find "$DIR" -type f \
+      \( -name "*.txt" -o -name "*.log" -o -name "*.json" -o -name "*.har" -o -name "*.md" \) \
+      -print0 2>/dev/null | \
+      xargs -0 -r -n 1 -P "$JOBS" bash "$SCRIPT_PATH" filter-file; then
+    echo -e "${RED}[SECURITY] ❌ Some files could not be filtered, review output above${NC}"
+    return 1
+  fi
 
   echo -e "${GREEN}[SECURITY] ✅ All files filtered${NC}"
 }
@@ -370,9 +627,24 @@ case "${1:-}" in
     filter_network_logs "$2" "$3"
     ;;
 
+  filter-file)
+    # Filter one artifact in place (used by filter-all workers)
+    filter_file "$2"
+    ;;
+
   filter-all)
     # Filter all files in directory
-    filter_all_directory "$2"
+    filter_all_directory "$2" "$3"
+    ;;
+
+  scan-staged)
+    # Scan staged blobs from the index (used by the git pre-commit hook)
+    scan_staged "$2" "$3"
+    ;;
+
+  scan-timed)
+    # Scan files and print their timings (used by scan-staged workers)
+    scan_timed "$2" "${@:3}"
     ;;
 
   pre-commit)
@@ -390,7 +662,9 @@ case "${1:-}" in
     echo "  scan-dir <dir> [pattern]       - Scan directory (default: *.txt)"
     echo "  filter-console <input> [out]   - Filter console logs"
     echo "  filter-network <input> [out]   - Filter network logs"
-    echo "  filter-all <dir>               - Filter all files in directory"
+    echo "  filter-file <file>             - Filter one artifact in place"
+    echo "  filter-all <dir> [jobs]        - Filter all files in directory (parallel)"
+    echo "  scan-staged [regex] [jobs]     - Scan staged blobs (cached, parallel)"
     echo "  pre-commit                     - Run pre-commit security scan"
     echo ""
     echo "Examples:"
@@ -30,7 +30,7 @@ BASE_URL="${BASE_URL:-http://localhost:3000}"
 TEST_EMAIL="${TEST_EMAIL:-feat-xxx-test@example.com}"
 TEST_PASSWORD="${TEST_PASSWORD:-test-feat-xxx-password}"
 SESSION="${SESSION:-ralph-$FEATURE_ID}"
-RESULTS_DIR="$SCRIPT_DIR/../test-results"
+RESULTS_DIR="${RESULTS_DIR:-$SCRIPT_DIR/../test-results}"
 
 ###############################################################################
 # Test Functions
@@ -18,6 +18,20 @@
 # Usage:
 #   ./ralph-feature.sh FEAT-XXX [max_iterations]
 #   ./ralph-feature.sh FEAT-004-invoice-pilot 15
+#   ./ralph-feature.sh --all [max_parallel] [max_iterations]
+#   ./ralph-feature.sh --wake [FEAT-XXX]
+#   ./ralph-feature.sh --render FEAT-XXX
+#
+# --all runs every unfinished feature from docs/features/_index.md, each in
+# its own git worktree (../<repo>-FEAT-XXX-loop), at most max_parallel at a
+# time. RALPH_MAX_CLAUDE caps concurrent `claude -p` calls across all loops
+# (default: max_parallel).
+#
+# --wake makes loops waiting on a PR (merge phase) re-check immediately instead
+# of finishing their backoff sleep; without an ID every waiting loop wakes.
+#
+# --render rebuilds the Ralph entries of context/session_log.md and the phase
+# table of status.md from the feature's event journal (context/journal.tsv).
 ###############################################################################
 
 set -e
@@ -25,8 +39,24 @@ set -e
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
-FEATURE_ID="${1:?Feature ID required (e.g., FEAT-001)}"
-MAX_ITERATIONS="${2:-15}"
+if [ "${1:-}" = "--all" ]; then
+  RUN_MODE="all"
+  FEATURE_ID="RALPH"
+  MAX_PARALLEL="${2:-3}"
+  MAX_ITERATIONS="${3:-15}"
+elif [ "${1:-}" = "--render" ]; then
+  RUN_MODE="render"
+  FEATURE_ID="${2:?Feature ID required (e.g., --render FEAT-001)}"
+  MAX_ITERATIONS=0
+elif [ "${1:-}" = "--wake" ]; then
+  RUN_MODE="wake"
+  FEATURE_ID="RALPH"
+  WAKE_TARGET="${2:-}"
+else
+  RUN_MODE="feature"
+  FEATURE_ID="${1:?Feature ID required (e.g., FEAT-001) or --all}"
+  MAX_ITERATIONS="${2:-15}"
+fi
 
 ITERATION=0
 CONSECUTIVE_FAILURES=0
@@ -43,6 +73,8 @@ STATUS_FILE="$FEATURE_DIR/status.md"
 SESSION_LOG="$FEATURE_DIR/context/session_log.md"
 DECISIONS_FILE="$FEATURE_DIR/context/decisions.md"
 WRAPUP_FILE="$FEATURE_DIR/context/wrap_up.md"
+# Absolute, so implement workers running in scratch worktrees write here too
+JOURNAL_FILE="$(pwd)/$FEATURE_DIR/context/journal.tsv"
 
 # Test paths (Phase 5.5)
 TEST_DIR="$FEATURE_DIR/tests"
@@ -52,9 +84,51 @@ TEST_RESULTS_DIR="$FEATURE_DIR/test-results"
 # Branch name - extract FEAT-XXX part
 BRANCH_NAME="feat/$(echo $FEATURE_ID | sed -E 's/^(FEAT-[0-9]+).*/\1/')"
 
+# Waiting for external action (PR review/merge): adaptive backoff bounds and
+# how long the shared PR status snapshot may be reused, in seconds
+WAIT_MIN="${RALPH_WAIT_MIN:-15}"
+WAIT_MAX="${RALPH_WAIT_MAX:-60}"
+PR_CACHE_TTL="${RALPH_PR_CACHE_TTL:-30}"
+WAIT_DELAY=0
+WAKE_REQUESTED=0
+
+# Tooling (security filters, memory index). The --all scheduler points loops
+# at the main tree's copy when .memory-system is not committed yet
+MEMORY_SYSTEM_DIR="${RALPH_MEMORY_SYSTEM:-.memory-system}"
+
 # Claude CLI flags
 CLAUDE_FLAGS="--dangerously-skip-permissions --output-format text"
 
+# Pause between iterations, in seconds; RALPH_TIMINGS=0 disables timing records
+ITERATION_PAUSE="${RALPH_ITERATION_PAUSE:-2}"
+TIMINGS="${RALPH_TIMINGS:-1}"
+
+# Implement phase: how many independent tasks run at once, each in its own
+# scratch worktree
+TASK_WORKERS="${RALPH_TASK_WORKERS:-3}"
+
+# Memory retrieval: snippets from past features added to phase prompts, and
+# their token budget (0 disables)
+MEMORY_SCRIPT="$MEMORY_SYSTEM_DIR/scripts/memory-index.sh"
+MEMORY_TOP_K="${RALPH_MEMORY_TOP_K:-5}"
+MEMORY_BUDGET="${RALPH_MEMORY_BUDGET:-1500}"
+TEMPLATE_SPEC="docs/features/_template/spec.md"
+
+# Scheduler (--all) paths
+# Shared by every worktree of this repo, so all loops see the same run dir
+SCRIPT_PATH="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/$(basename "${BASH_SOURCE[0]}")"
+GIT_COMMON_DIR="$(cd "$(git rev-parse --git-common-dir 2>/dev/null || echo .)" && pwd)"
+RALPH_RUN_DIR="${RALPH_RUN_DIR:-$GIT_COMMON_DIR/ralph}"
+INDEX_FILE="docs/features/_index.md"
+
+# Runtime files live under .git, never in the tracked feature folder. The
+# phase snapshot describes this worktree's checkout, so it goes in the
+# worktree's own git dir; timings and the journal lock are shared.
+GIT_DIR_ABS="$(cd "$(git rev-parse --git-dir 2>/dev/null || echo .)" && pwd)"
+STATE_FILE="$GIT_DIR_ABS/ralph/state/$FEATURE_ID"
+TIMINGS_FILE="$RALPH_RUN_DIR/timings/$FEATURE_ID.tsv"
+JOURNAL_LOCK="$RALPH_RUN_DIR/locks/journal-$FEATURE_ID"
+
 # Colors
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -91,19 +165,401 @@ log_phase() {
   echo ""
 }
 
+# ============================================================================
+# EVENT JOURNAL
+# ============================================================================
+# context/journal.tsv is the append-only record of what Ralph did:
+#   <YYYY-MM-DD HH:MM:SS> TAB <phase> TAB <kind> TAB <message>
+# kind "log" becomes a session_log.md entry, kind "status" a status.md row
+# ("Phase|Status|Notes"). Appends are single lines under a lock, so any number
+# of loops/workers can write at once. The markdown views are rendered from
+# the journal on demand (loop exit, --render) instead of on every call.
+with_journal_lock() {
+  mkdir -p "$(dirname "$JOURNAL_FILE")" "$(dirname "$JOURNAL_LOCK")"
+
+  if command -v flock >/dev/null 2>&1; then
+    (
+      flock 9
+      "$@"
+    ) 9>> "$JOURNAL_LOCK.lock"
+    return
+  fi
+
+  # No flock: mkdir is the lock and $lock/pid its owner. A lock whose owner
+  # is gone (loop killed mid-append) is broken instead of waited on forever.
+  local lock="$JOURNAL_LOCK.lockdir"
+  local owner
+  until mkdir "$lock" 2>/dev/null; do
+    owner=$(cat "$lock/pid" 2>/dev/null || true)
+    if [ -n "$owner" ] && ! kill -0 "$owner" 2>/dev/null; then
+      rm -rf "$lock"
+      continue
+    fi
+    sleep 0.1
+  done
+  echo $$ > "$lock/pid"
+  local rc=0
+  "$@" || rc=$?
+  rm -rf "$lock"
+  return $rc
+}
+
+append_journal_line() {
+  printf '%s\n' "$1" >> "$JOURNAL_FILE"
+}
+
+journal_append() {
+  local kind=$1
+  shift
+  local message="$*"
+
+  # One event per line
+  message=${message//$'\t'/ }
+  message=${message//$'\n'/ }
+
+  local line
+  printf -v line '%s\t%s\t%s\t%s' "$(date +"%Y-%m-%d %H:%M:%S")" "${CURRENT_PHASE:--}" "$kind" "$message"
+  with_journal_lock append_journal_line "$line"
+}
+
 add_session_log() {
-  local message=$1
-  local timestamp=$(date +"%Y-%m-%d %H:%M")
+  journal_append log "$1"
+}
 
-  if [ -f "$SESSION_LOG" ]; then
-    # Insert at top after header
-    local header=$(head -20 "$SESSION_LOG")
-    local rest=$(tail -n +21 "$SESSION_LOG")
-    echo "$header" > "$SESSION_LOG"
-    echo "" >> "$SESSION_LOG"
-    echo "### [$timestamp] - [RALPH] $message" >> "$SESSION_LOG"
-    echo "" >> "$SESSION_LOG"
-    echo "$rest" >> "$SESSION_LOG"
+update_status_row() {
+  # Set Status/Date/Notes of one row of the status.md phase table
+  local phase=$1
+  local status=$2
+  local notes=$3
+  local date=$4
+  local tmp="$STATUS_FILE.tmp.$$"
+
+  [ -f "$STATUS_FILE" ] || return 0
+
+  if awk -F'|' -v OFS='|' -v ph="$phase" -v st=" $status " -v dt=" $date " -v nt=" $notes " '
+      { key = $2; gsub(/^ +| +$/, "", key) }
+      !found && key == ph && NF >= 6 { $3 = st; $4 = dt; $5 = nt; found = 1 }
+      { print }
+      END { exit !found }
+    ' "$STATUS_FILE" > "$tmp"; then
+    mv "$tmp" "$STATUS_FILE"
+  else
+    # Custom status.md without this row
+    rm -f "$tmp"
+    echo "| $phase | $status | $date | $notes |" >> "$STATUS_FILE"
+  fi
+}
+
+set_phase_status() {
+  local phase=$1
+  local status=$2
+  local notes=${3:--}
+  notes=${notes//|//}
+
+  journal_append status "$phase|$status|$notes"
+  update_status_row "$phase" "$status" "$notes" "$(date +%Y-%m-%d)"
+}
+
+write_session_log() {
+  local tmp="$SESSION_LOG.tmp.$$"
+  local begin="<!-- RALPH-JOURNAL:BEGIN -->"
+  local end="<!-- RALPH-JOURNAL:END -->"
+  local has_block=0
+  grep -qF "$begin" "$SESSION_LOG" && has_block=1
+
+  # Ralph's block goes where new entries are added (top of the log), newest
+  # first; everything outside the block is left as written
+  awk -v begin="$begin" -v end="$end" -v journal="$JOURNAL_FILE" -v has_block=$has_block '
+    function emit(   line, f, n, i) {
+      n = 0
+      while ((getline line < journal) > 0) {
+        split(line, f, "\t")
+        if (f[3] == "log") rows[++n] = "### [" substr(f[1], 1, 16) "] - [RALPH] " f[4]
+      }
+      print begin
+      for (i = n; i >= 1; i--) { print ""; print rows[i] }
+      print ""
+      print end
+      placed = 1
+    }
+    has_block && $0 == begin { emit(); skip = 1; next }
+    skip { if ($0 == end) skip = 0; next }
+    { print }
+    !has_block && !placed && /ENTRADAS ARRIBA|NEW ENTRIES/ { print ""; emit() }
+    END { if (!placed) { print ""; emit() } }
+  ' "$SESSION_LOG" > "$tmp"
+  mv "$tmp" "$SESSION_LOG"
+}
+
+write_status_table() {
+  # Latest status event per phase, in journal order
+  local phase status notes date
+  while IFS=$'\t' read -r date phase status notes; do
+    update_status_row "$phase" "$status" "$notes" "$date"
+  done < <(awk -F'\t' '
+    $3 == "status" {
+      split($4, f, "|")
+      if (!(f[1] in last)) order[++n] = f[1]
+      last[f[1]] = substr($1, 1, 10) "\t" f[1] "\t" f[2] "\t" f[3]
+    }
+    END { for (i = 1; i <= n; i++) print last[order[i]] }
+  ' "$JOURNAL_FILE")
+}
+
+render_journal() {
+  [ -f "$JOURNAL_FILE" ] || return 0
+
+  [ -f "$SESSION_LOG" ] && with_journal_lock write_session_log
+  [ -f "$STATUS_FILE" ] && with_journal_lock write_status_table
+  return 0
+}
+
+report_loop_state() {
+  # Tell the --all scheduler where this loop is (no-op when run standalone)
+  [ -n "${RALPH_SCHEDULED:-}" ] || return 0
+
+  local phase=$1
+  local state=$2
+  local status_file="$RALPH_RUN_DIR/status/$FEATURE_ID"
+
+  mkdir -p "$RALPH_RUN_DIR/status"
+  printf '%s\t%s\n' "$phase" "$state" > "$status_file.tmp.$$"
+  mv "$status_file.tmp.$$" "$status_file"
+}
+
+# ============================================================================
+# TIMINGS
+# ============================================================================
+# $TIMINGS_FILE gets one line per timed step, so runs can be compared against
+# a baseline (see .memory-system/scripts/bench-ralph-loop.sh):
+#   <epoch_ms> TAB <iteration> TAB <phase> TAB <kind> TAB <name> TAB <ms> TAB <rc>
+# kind is iteration, detect, phase, claude, git, gh, memory, filter, test or
+# wait. Clocks come from $EPOCHREALTIME, so timing a call costs no fork.
+now_us() {
+  echo "${EPOCHREALTIME//[!0-9]/}"
+}
+
+# record_timing kind name start_us rc
+record_timing() {
+  [ "$TIMINGS" != "0" ] && [ -d "$FEATURE_DIR" ] || return 0
+  [ -d "${TIMINGS_FILE%/*}" ] || mkdir -p "${TIMINGS_FILE%/*}"
+
+  local end=${EPOCHREALTIME//[!0-9]/}
+  printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\n' "$((end / 1000))" "$ITERATION" "${CURRENT_PHASE:--}" \
+    "$1" "${2//$'\t'/ }" "$(( (end - $3) / 1000 ))" "$4" >> "$TIMINGS_FILE"
+}
+
+# timed kind name command... - run and record a command
+timed() {
+  local kind=$1
+  local name=$2
+  shift 2
+
+  local start=${EPOCHREALTIME//[!0-9]/}
+  local rc=0
+  "$@" || rc=$?
+  record_timing "$kind" "$name" "$start" $rc
+  return $rc
+}
+
+# Every git/gh call in this script is timed, named by its subcommand
+git() {
+  local start=${EPOCHREALTIME//[!0-9]/}
+  local rc=0
+  command git "$@" || rc=$?
+  [ "$1" = "-C" ] && record_timing git "$3" "$start" $rc || record_timing git "$1" "$start" $rc
+  return $rc
+}
+
+gh() {
+  local start=${EPOCHREALTIME//[!0-9]/}
+  local rc=0
+  command gh "$@" || rc=$?
+  record_timing gh "$1 ${2:-}" "$start" $rc
+  return $rc
+}
+
+# ============================================================================
+# CLAUDE CALLS
+# ============================================================================
+# Every `claude` call in this script goes through this wrapper. When
+# RALPH_MAX_CLAUDE is set (the --all scheduler exports it), the call must hold
+# one of the slot directories under $RALPH_RUN_DIR/claude-slots, so parallel
+# feature loops never run more than RALPH_MAX_CLAUDE model calls at once.
+acquire_claude_slot() {
+  local slots_dir="$RALPH_RUN_DIR/claude-slots"
+  mkdir -p "$slots_dir"
+
+  while true; do
+    local i
+    for ((i = 1; i <= RALPH_MAX_CLAUDE; i++)); do
+      if mkdir "$slots_dir/$i" 2>/dev/null; then
+        echo $$ > "$slots_dir/$i/pid"
+        CLAUDE_SLOT="$slots_dir/$i"
+        return 0
+      fi
+
+      # Reclaim slots held by loops that were killed mid-call
+      local owner=$(cat "$slots_dir/$i/pid" 2>/dev/null || true)
+      if [ -n "$owner" ] && ! kill -0 "$owner" 2>/dev/null; then
+        rm -rf "$slots_dir/$i"
+      fi
+    done
+    sleep 1
+  done
+}
+
+release_claude_slot() {
+  [ -n "${CLAUDE_SLOT:-}" ] && rm -rf "$CLAUDE_SLOT"
+  CLAUDE_SLOT=""
+}
+
+# Prompt size and call latency (after any slot wait) are recorded as timing
+# kind "claude" so the effect of memory injection can be measured.
+claude() {
+  local chars=0 arg
+  for arg in "$@"; do
+    chars=$((chars + ${#arg}))
+  done
+
+  [ -z "${RALPH_MAX_CLAUDE:-}" ] || acquire_claude_slot
+  local start=${EPOCHREALTIME//[!0-9]/}
+  local rc=0
+  command claude "$@" || rc=$?
+  [ -z "${RALPH_MAX_CLAUDE:-}" ] || release_claude_slot
+
+  record_timing claude "prompt ${chars}c ~$((chars / 4))t" "$start" $rc
+  return $rc
+}
+
+# ============================================================================
+# MEMORY RETRIEVAL
+# ============================================================================
+# Phase prompts get the few most relevant sections of past features' spec,
+# decisions and wrap-up docs (.memory-system/scripts/memory-index.sh) instead
+# of whole documents. The index is refreshed incrementally on each query.
+# What was injected, its size and the lookup time are recorded as timing kind
+# "memory".
+
+# Query text for this feature: its _index.md row and the top of spec.md.
+# Only what was filled in: lines unchanged from the template and placeholders
+# (_TBD_, _[...]_) would match every past feature alike.
+memory_query() {
+  echo "${FEATURE_ID//-/ }"
+  grep -F "$FEATURE_ID" "$INDEX_FILE" 2>/dev/null | head -1 || true
+  grep -v '^[[:space:]]*$' "$SPEC_FILE" 2>/dev/null | \
+    grep -vxF -f <(cat "$TEMPLATE_SPEC" 2>/dev/null) | \
+    grep -vE '_TBD_|_\[[^]]*\]_' | head -40 || true
+  [ $# -eq 0 ] || echo "$@"
+}
+
+# Prompt block with past lessons for phase $1; extra query words in $2..
+memory_context() {
+  local phase=$1
+  shift
+
+  [ "$MEMORY_BUDGET" -gt 0 ] 2>/dev/null && [ -f "$MEMORY_SCRIPT" ] || return 0
+
+  local stats=$(mktemp)
+  local start=${EPOCHREALTIME//[!0-9]/}
+  local snippets=$(bash "$MEMORY_SCRIPT" query "$(memory_query "$@")" \
+    "$MEMORY_TOP_K" "$MEMORY_BUDGET" "$FEATURE_ID" 2>"$stats" || true)
+  record_timing memory "$phase: $(tail -1 "$stats")" "$start" 0
+  rm -f "$stats"
+
+  [ -n "$snippets" ] || return 0
+  echo "
+
+Lessons from past features (most relevant excerpts; read the full docs only if needed):
+
+$snippets"
+}
+
+# ============================================================================
+# STATE SNAPSHOT
+# ============================================================================
+# $STATE_FILE (key=value lines, under .git) caches what phase detection
+# derived from the feature documents. The cached phase is reused while the
+# fingerprint of its inputs (document checksums + HEAD) is unchanged. PR state
+# is recorded when the loop creates or observes a PR, so `gh` is only called
+# when the answer really depends on GitHub.
+state_get() {
+  local key=$1
+  [ -f "$STATE_FILE" ] || return 0
+
+  local k v
+  while IFS='=' read -r k v; do
+    if [ "$k" = "$key" ]; then
+      echo "$v"
+      return 0
+    fi
+  done < "$STATE_FILE"
+}
+
+state_set() {
+  # state_set key value [key value ...]
+  local -A updates=()
+  while [ $# -ge 2 ]; do
+    updates[$1]=$2
+    shift 2
+  done
+
+  mkdir -p "$(dirname "$STATE_FILE")"
+  local tmp="$STATE_FILE.tmp.$$"
+  local k v
+  {
+    if [ -f "$STATE_FILE" ]; then
+      while IFS='=' read -r k v; do
+        if [ -n "${updates[$k]+set}" ]; then
+          echo "$k=${updates[$k]}"
+          unset "updates[$k]"
+        else
+          echo "$k=$v"
+        fi
+      done < "$STATE_FILE"
+    fi
+    for k in "${!updates[@]}"; do
+      echo "$k=${updates[$k]}"
+    done
+  } > "$tmp"
+  mv "$tmp" "$STATE_FILE"
+}
+
+phase_fingerprint() {
+  # Everything detect_current_phase reads, hashed in one pass
+  {
+    cksum "$STATUS_FILE" "$SPEC_FILE" "$ANALYSIS_FILE" "$TASKS_FILE" "$WRAPUP_FILE"
+    git rev-parse HEAD
+    # Uncommitted edits count too (has_frontend_changes looks at them)
+    git diff --name-only HEAD
+    [ -d "$TEST_DIR" ] && echo "tests"
+  } 2>/dev/null | cksum | cut -d' ' -f1
+}
+
+commit_feature_folder() {
+  # Commit this feature's docs (spec, design, status, context, test results)
+  # on the feature branch after a phase, so they reach the PR and main. Before
+  # the Branch phase they stay uncommitted and move with `git checkout -b`.
+  local phase=$1
+
+  [ "$(git branch --show-current 2>/dev/null)" = "$BRANCH_NAME" ] || return 0
+  [ -n "$(git status --porcelain -- "$FEATURE_DIR" 2>/dev/null)" ] || return 0
+
+  if ! { git add -A -- "$FEATURE_DIR" && \
+      git commit -q -m "$FEATURE_ID: $phase docs" -- "$FEATURE_DIR" >/dev/null; }; then
+    log WARNING "Could not commit $FEATURE_DIR after the $phase phase"
+  fi
+}
+
+record_phase_result() {
+  local phase=$1
+  local result=$2
+  local now=$(date +%Y-%m-%dT%H:%M:%S)
+
+  if [ $result -eq 0 ] || [ $result -eq 100 ]; then
+    state_set last_phase "$phase" last_result "$result" updated "$now" "done_$phase" "$now"
+  else
+    state_set last_phase "$phase" last_result "$result" updated "$now"
   fi
 }
 
@@ -147,9 +603,22 @@ is_branch_created() {
   return $?
 }
 
+in_linked_worktree() {
+  # True inside a worktree created by the --all scheduler (or `git worktree add`)
+  [ "$GIT_DIR_ABS" != "$GIT_COMMON_DIR" ]
+}
+
 is_implementation_complete() {
   [ ! -f "$TASKS_FILE" ] && return 1
 
+  # Structured tasks ("- [ ] **B1**: ..."): complete when all are ticked;
+  # checklists without an ID (e.g. Pre-Implementation) do not count
+  local tasks=$(list_tasks)
+  if [ -n "$tasks" ]; then
+    printf '%s\n' "$tasks" | cut -f2 | grep -qx 0 && return 1
+    return 0
+  fi
+
   local total=$(grep -E '^-\s*\[' "$TASKS_FILE" | wc -l)
   local complete=$(grep -E '^-\s*\[x\]' "$TASKS_FILE" | wc -l)
 
@@ -160,10 +629,40 @@ is_implementation_complete() {
   return 1
 }
 
+base_branch_ref() {
+  # The branch features start from and are merged into
+  local ref
+  for ref in origin/main origin/master main master; do
+    if git rev-parse --verify --quiet "$ref^{commit}" >/dev/null; then
+      echo "$ref"
+      return 0
+    fi
+  done
+  echo "HEAD"
+}
+
 has_frontend_changes() {
-  # Check if there are tsx/jsx/css/scss files in recent commits
-  git diff --name-only HEAD~5 2>/dev/null | grep -E '\.(tsx?|jsx?|css|scss)$' >/dev/null
-  return $?
+  # Check if there are tsx/jsx/css/scss files changed on this branch (since
+  # its merge-base with the base branch) or in uncommitted edits. The
+  # committed part is cached per merge-base..HEAD range; the working tree is
+  # checked every time since editing it does not move HEAD.
+  local pattern='\.(tsx?|jsx?|css|scss)$'
+  local head=$(git rev-parse HEAD 2>/dev/null || true)
+  local base=$(git merge-base "$(base_branch_ref)" HEAD 2>/dev/null || true)
+  local range="$base..$head"
+  local changed
+  if [ -n "$head" ] && [ "$(state_get frontend_range)" = "$range" ]; then
+    changed=$(state_get frontend_changes)
+  else
+    changed=0
+    if [ -n "$base" ]; then
+      git diff --name-only "$base" HEAD 2>/dev/null | grep -E "$pattern" >/dev/null && changed=1
+    fi
+    state_set frontend_range "$range" frontend_changes "$changed"
+  fi
+  [ "$changed" = "1" ] && return 0
+
+  git diff --name-only HEAD 2>/dev/null | grep -E "$pattern" >/dev/null
 }
 
 is_verify_needed() {
@@ -181,29 +680,97 @@ is_verify_complete() {
   return $?
 }
 
+file_age() {
+  echo $(( $(date +%s) - $(stat -c %Y "$1" 2>/dev/null || echo 0) ))
+}
+
+batched_pr_states() {
+  # "<head branch><TAB><state>" for every Ralph PR in the repo, newest first.
+  # One `gh pr list` serves every loop (the file lives in the shared run dir)
+  # and is refreshed at most every PR_CACHE_TTL seconds.
+  local cache="$RALPH_RUN_DIR/pr-states.tsv"
+  local lock="$RALPH_RUN_DIR/pr-states.lock"
+  mkdir -p "$RALPH_RUN_DIR"
+
+  # Drop locks left behind by killed loops
+  [ -d "$lock" ] && [ $(file_age "$lock") -gt 60 ] && rmdir "$lock" 2>/dev/null
+
+  if [ ! -f "$cache" ] || [ $(file_age "$cache") -ge $PR_CACHE_TTL ]; then
+    if mkdir "$lock" 2>/dev/null; then
+      if gh pr list --state all --limit 200 --json headRefName,state \
+          --jq '.[] | select(.headRefName | startswith("feat/")) | [.headRefName, .state] | @tsv' \
+          > "$cache.tmp.$$" 2>/dev/null; then
+        mv "$cache.tmp.$$" "$cache"
+      else
+        rm -f "$cache.tmp.$$"
+      fi
+      rmdir "$lock"
+    else
+      # Another loop is refreshing right now
+      sleep 2
+    fi
+  fi
+
+  cat "$cache" 2>/dev/null || true
+}
+
+fetch_pr_state() {
+  # Answer from the batched query; the answer is recorded in the snapshot
+  local state=$(batched_pr_states | awk -F'\t' -v b="$BRANCH_NAME" '$1 == b { print $2; exit }')
+
+  if [ -z "$state" ]; then
+    # Not in the batch (no PR yet, or beyond the list limit)
+    state=$(gh pr view --json state 2>/dev/null | jq -r '.state' 2>/dev/null || true)
+    [ "$state" = "null" ] && state=""
+  fi
+
+  state_set pr_state "$state"
+  echo "$state"
+}
+
 is_pr_created() {
-  gh pr view --json state >/dev/null 2>&1
-  return $?
+  # A PR does not disappear once created, so any recorded state is final
+  [ -n "$(state_get pr_state)" ] && return 0
+  [ -n "$(fetch_pr_state)" ]
 }
 
 is_pr_merged() {
-  local state=$(gh pr view --json state 2>/dev/null | jq -r '.state')
-  [ "$state" = "MERGED" ] && return 0
-  return 1
+  [ "$(state_get pr_state)" = "MERGED" ] && return 0
+  [ "$(fetch_pr_state)" = "MERGED" ]
 }
 
 get_current_phase() {
+  # Reuse the snapshot unless one of the detection inputs changed
+  local fingerprint=$(phase_fingerprint)
+  if [ "$(state_get fingerprint)" = "$fingerprint" ]; then
+    local cached=$(state_get phase)
+    if [ -n "$cached" ]; then
+      echo "$cached"
+      return
+    fi
+  fi
+
+  local phase=$(detect_current_phase)
+  state_set fingerprint "$fingerprint" phase "$phase"
+  echo "$phase"
+}
+
+detect_current_phase() {
   [ ! -f "$STATUS_FILE" ] && echo "unknown" && return
 
-  # Check status markers
-  local interview=$(grep -c "| Interview |.*Complete" "$STATUS_FILE")
-  local analysis=$(grep -c "| Critical Analysis |.*Complete" "$STATUS_FILE")
-  local plan=$(grep -c "| Plan |.*Complete" "$STATUS_FILE")
-  local branch=$(grep -c "| Branch |.*Complete" "$STATUS_FILE")
-  local implement=$(grep -c "| Implement |.*Complete" "$STATUS_FILE")
-  local verify=$(grep -c "| Verify |.*Complete" "$STATUS_FILE")
-  local pr=$(grep -c "| PR |.*Complete" "$STATUS_FILE")
-  local merge=$(grep -c "| Merge |.*Complete" "$STATUS_FILE")
+  # Check status markers (one pass over status.md)
+  local interview analysis plan branch implement verify pr merge
+  read -r interview analysis plan branch implement verify pr merge < <(awk '
+    /\| Interview \|.*Complete/ { f[1] = 1 }
+    /\| Critical Analysis \|.*Complete/ { f[2] = 1 }
+    /\| Plan \|.*Complete/ { f[3] = 1 }
+    /\| Branch \|.*Complete/ { f[4] = 1 }
+    /\| Implement \|.*Complete/ { f[5] = 1 }
+    /\| Verify \|.*Complete/ { f[6] = 1 }
+    /\| PR \|.*Complete/ { f[7] = 1 }
+    /\| Merge \|.*Complete/ { f[8] = 1 }
+    END { printf "%d %d %d %d %d %d %d %d\n", f[1], f[2], f[3], f[4], f[5], f[6], f[7], f[8] }
+  ' "$STATUS_FILE")
 
   # Check wrap_up.md for completion
   if [ -f "$WRAPUP_FILE" ] && grep -q "Wrap-up completado\|Wrap-Up Complete" "$WRAPUP_FILE"; then
@@ -212,9 +779,9 @@ get_current_phase() {
   elif [ $pr -gt 0 ]; then echo "merge"
   elif [ $verify -gt 0 ]; then echo "pr"
   elif [ $implement -gt 0 ]; then
+    # The Implement row is only marked Complete once no task is pending
     if is_verify_needed; then echo "verify"
-    elif is_implementation_complete; then echo "pr"
-    else echo "implement"
+    else echo "pr"
     fi
   elif [ $branch -gt 0 ]; then
     if is_implementation_complete; then
@@ -287,7 +854,7 @@ Steps:
 5. Add checkpoint to $SESSION_LOG
 
 When complete, emit: INTERVIEW_COMPLETE
-If human input is needed, emit: INTERVIEW_NEEDS_INPUT"
+If human input is needed, emit: INTERVIEW_NEEDS_INPUT$(memory_context interview)"
 
   echo "[→] Executing Claude..." >&2
   local output=$(claude -p "$prompt" $CLAUDE_FLAGS 2>&1)
@@ -316,7 +883,7 @@ invoke_analysis() {
     log INFO "Analysis already complete, skipping..."
     # Mark as complete if not already marked
     if ! grep -q "Critical Analysis.*✅" "$STATUS_FILE"; then
-      sed -i 's/| Critical Analysis | ⬜ Pending/| Critical Analysis | ✅ Complete/' "$STATUS_FILE"
+      set_phase_status "Critical Analysis" "✅ Complete" "analysis.md already complete"
       log INFO "Marked Analysis as complete in status.md"
     fi
     return 0
@@ -355,7 +922,7 @@ Steps to execute: $steps_to_run
 Execute the 11-step protocol and create $ANALYSIS_FILE.
 
 When complete, emit: ANALYSIS_COMPLETE
-If pause needed, emit: ANALYSIS_NEEDS_REVIEW"
+If pause needed, emit: ANALYSIS_NEEDS_REVIEW$(memory_context analysis risks)"
 
   log INFO "Running 11-step protocol (depth: $depth)..."
   echo "[→] Executing Claude..." >&2
@@ -384,7 +951,7 @@ invoke_plan() {
   if is_plan_complete; then
     log INFO "Plan already complete, skipping..."
     if ! grep -q "Plan.*✅" "$STATUS_FILE"; then
-      sed -i 's/| Plan | ⬜ Pending/| Plan | ✅ Complete/' "$STATUS_FILE"
+      set_phase_status "Plan" "✅ Complete" "design.md + tasks.md already present"
       log INFO "Marked Plan as complete in status.md"
     fi
     return 0
@@ -395,7 +962,7 @@ invoke_plan() {
 Create $DESIGN_FILE and $TASKS_FILE.
 Update $STATUS_FILE to mark Plan as ✅.
 
-When complete, emit: <phase>PLAN_COMPLETE</phase>"
+When complete, emit: <phase>PLAN_COMPLETE</phase>$(memory_context plan design decisions)"
 
   echo "[→] Executing Claude..." >&2
   local output=$(claude -p "$prompt" $CLAUDE_FLAGS 2>&1)
@@ -421,15 +988,21 @@ invoke_branch() {
     return 0
   fi
 
-  git checkout main 2>/dev/null || git checkout master 2>/dev/null
-  git pull origin main 2>/dev/null || git pull origin master 2>/dev/null
-  git checkout -b "$BRANCH_NAME"
+  if in_linked_worktree; then
+    # Scheduler worktrees start detached at the tip of the base branch, which
+    # stays checked out in the main working tree
+    git checkout -b "$BRANCH_NAME"
+  else
+    git checkout main 2>/dev/null || git checkout master 2>/dev/null
+    git pull origin main 2>/dev/null || git pull origin master 2>/dev/null
+    git checkout -b "$BRANCH_NAME"
+  fi
 
   log SUCCESS "Branch created: $BRANCH_NAME"
   add_session_log "Branch Created ✅ - $BRANCH_NAME"
 
   # Update status
-  claude -p "Update $STATUS_FILE to mark Branch phase as ✅. Emit: <phase>BRANCH_COMPLETE</phase>" $CLAUDE_FLAGS >/dev/null 2>&1
+  set_phase_status "Branch" "✅ Complete" "$BRANCH_NAME"
   return 0
 }
 
@@ -445,9 +1018,17 @@ invoke_implement() {
   if [ $remaining -eq 0 ]; then
     log SUCCESS "All tasks complete!"
     add_session_log "Implementation Complete ✅"
+    set_phase_status "Implement" "✅ Complete" "All tasks done"
     return 0
   fi
 
+  # Structured tasks ("- [ ] **B1**: ...") are scheduled by dependency;
+  # free-form task lists keep the single batched call below
+  if [ -n "$(list_tasks)" ]; then
+    implement_tasks
+    return $?
+  fi
+
   local batch_size=3
 
   local prompt="You are executing the IMPLEMENT phase for $FEATURE_ID.
@@ -456,7 +1037,7 @@ Iteration $ITERATION. Progress: $complete/$total tasks.
 Complete up to $batch_size tasks from $TASKS_FILE.
 
 If all done, emit: <phase>IMPLEMENT_COMPLETE</phase>
-If progress made, emit: <phase>IMPLEMENT_PROGRESS</phase>"
+If progress made, emit: <phase>IMPLEMENT_PROGRESS</phase>$(memory_context implement)"
 
   echo "[→] Executing Claude..." >&2
   local output=$(claude -p "$prompt" $CLAUDE_FLAGS 2>&1)
@@ -476,6 +1057,422 @@ If progress made, emit: <phase>IMPLEMENT_PROGRESS</phase>"
   fi
 }
 
+# ============================================================================
+# PARALLEL IMPLEMENT
+# ============================================================================
+# Tasks are the "- [ ] **B1**: ..." items of tasks.md. A task depends on the
+# IDs in "(depends: B1, F2)" on its line or in the "Task Dependencies" table
+# of design.md; a task with neither depends on the previous task of its own
+# section (B2 after B1). Ready tasks run at the same time, one worker per
+# task in a scratch worktree, and their commits are cherry-picked back onto
+# the feature branch in tasks.md order. A task whose commits conflict is
+# requeued and later runs alone in this tree.
+
+# Prints "<id>\t<done 0|1>\t<deps,...|->\t<title>" per task, in tasks.md order
+list_tasks() {
+  [ -f "$TASKS_FILE" ] || return 0
+
+  awk -v design="$DESIGN_FILE" '
+    BEGIN {
+      while ((getline line < design) > 0) {
+        if (line ~ /^## /) in_deps = (line ~ /^## Task Dependencies/)
+        if (in_deps && line ~ /^\| *[A-Z][0-9]+ *\|/) {
+          split(line, cell, "|")
+          id = cell[2]; deps = cell[3]
+          gsub(/ /, "", id); gsub(/[ -]/, "", deps)
+          table[id] = deps
+        }
+      }
+    }
+    /^- \[[ x]\] \*\*[A-Z][0-9]+\*\*/ {
+      done = ($0 ~ /^- \[x\]/)
+      match($0, /\*\*[A-Z][0-9]+\*\*/)
+      id = substr($0, RSTART + 2, RLENGTH - 4)
+      title = substr($0, RSTART + RLENGTH)
+      sub(/^:? */, "", title)
+
+      deps = ""; explicit = 0
+      if (match(title, /\((depends( on)?|after):?[^)]*\)/)) {
+        deps = substr(title, RSTART, RLENGTH)
+        sub(/^\((depends( on)?|after):?/, "", deps)
+        gsub(/[) ]/, "", deps)
+        explicit = 1
+      } else if (id in table) {
+        deps = table[id]
+        explicit = 1
+      }
+
+      section = substr(id, 1, 1)
+      if (!explicit && (section in prev)) deps = prev[section]
+      prev[section] = id
+
+      print id "\t" done "\t" (deps == "" ? "-" : deps) "\t" title
+    }' "$TASKS_FILE"
+}
+
+# Subtask lines indented under task $1
+task_details() {
+  awk -v id="$1" '
+    /^- / { inside = ($0 ~ ("\\*\\*" id "\\*\\*")); next }
+    inside && /^[ \t]+- / { print }
+    inside && /^[^ \t]/ { inside = 0 }' "$TASKS_FILE"
+}
+
+# Tick task $1 and its subtasks in tasks.md
+mark_task_done() {
+  local tmp="$TASKS_FILE.tmp.$$"
+
+  awk -v id="$1" '
+    /^- / { inside = ($0 ~ ("\\*\\*" id "\\*\\*")) }
+    inside && /^[^ \t-]/ { inside = 0 }
+    inside { sub(/- \[ \]/, "- [x]") }
+    { print }' "$TASKS_FILE" > "$tmp" && mv "$tmp" "$TASKS_FILE"
+}
+
+task_prompt() {
+  local id=$1
+  local title=$2
+  local root=$(pwd)
+
+  echo "You are executing task $id of the IMPLEMENT phase for $FEATURE_ID.
+Iteration $ITERATION.
+
+Task $id: $title
+$(task_details "$id")
+
+Context (read only): $root/$SPEC_FILE, $root/$DESIGN_FILE, $root/$TASKS_FILE
+
+Rules:
+- Implement ONLY task $id; other tasks are handled by other workers
+- Do NOT edit tasks.md, status.md or $FEATURE_DIR/context/ (Ralph updates them)
+- Commit your changes with messages starting with \"$FEATURE_ID: $id\"
+
+When done, emit: <task>TASK_COMPLETE</task>
+If blocked, emit: <task>TASK_BLOCKED</task>$(memory_context implement "$title")"
+}
+
+# Commit the tasks.md ticks for the given task IDs
+commit_task_progress() {
+  local id
+  for id in "$@"; do
+    mark_task_done "$id"
+  done
+
+  git add "$TASKS_FILE" 2>/dev/null || true
+  git commit -q -m "$FEATURE_ID: complete tasks $*" -- "$TASKS_FILE" >/dev/null 2>&1 || \
+    log WARNING "Could not commit $TASKS_FILE (left staged)"
+}
+
+# Paths outside the feature folder that differ from HEAD (changed or new)
+changed_paths() {
+  {
+    git diff -z --name-only HEAD -- . ":!$FEATURE_DIR"
+    git ls-files -z --others --exclude-standard -- . ":!$FEATURE_DIR"
+  } 2>/dev/null | tr '\0' '\n' | sort -u
+}
+
+# Commit what a task worker left uncommitted: only the paths that were not
+# already changed before it ran ($2, from changed_paths), so local edits and
+# anything staged by hand stay out of the task commit
+commit_worker_leftovers() {
+  local message=$1
+  local before=$2
+  local paths=()
+
+  mapfile -t paths < <(comm -13 <(printf '%s\n' "$before") <(changed_paths))
+  [ ${#paths[@]} -gt 0 ] || return 0
+  git add -- "${paths[@]}" && git commit -q -m "$message" -- "${paths[@]}" >/dev/null
+}
+
+# Run one task in this tree (single ready task, or requeued after a conflict)
+run_task_serial() {
+  local id=$1
+  local title=$2
+
+  log INFO "Task $id: $title"
+  echo "[→] Executing Claude..." >&2
+  local before=$(changed_paths)
+  local output=$(claude -p "$(task_prompt "$id" "$title")" $CLAUDE_FLAGS 2>&1)
+
+  if ! echo "$output" | grep -q "<task>TASK_COMPLETE</task>"; then
+    log WARNING "Task $id: no completion signal"
+    return 1
+  fi
+
+  # Workers are asked to commit; pick up what this one left behind
+  commit_worker_leftovers "$FEATURE_ID: $id $title" "$before"
+
+  commit_task_progress "$id"
+  state_set serial_tasks "$(echo " $(state_get serial_tasks) " | sed "s/ $id / /; s/^ *//; s/ *$//")"
+  log SUCCESS "Task $id complete"
+  add_session_log "Implement: task $id complete"
+  return 0
+}
+
+# Run ready tasks concurrently, one scratch worktree each, then merge back
+run_tasks_parallel() {
+  local base=$(git rev-parse HEAD)
+  local scratch=$(mktemp -d "${TMPDIR:-/tmp}/ralph-$FEATURE_ID-tasks.XXXXXX")
+  local id pids=()
+
+  for id in "$@"; do
+    if ! git worktree add -q --detach "$scratch/$id" "$base" >/dev/null 2>&1; then
+      log ERROR "Task $id: could not create worktree"
+      continue
+    fi
+    local prompt=$(task_prompt "$id" "${task_title[$id]}")
+    log INFO "Task $id: worker started"
+    (cd "$scratch/$id" && claude -p "$prompt" $CLAUDE_FLAGS > "$scratch/$id.out" 2>&1) &
+    pids+=($!)
+  done
+  [ ${#pids[@]} -gt 0 ] && wait "${pids[@]}" || true
+
+  # Merge back in tasks.md order so the history reads like a serial run
+  local merged=() requeued=() failed=()
+  for id in "$@"; do
+    [ -d "$scratch/$id" ] || { failed+=("$id"); continue; }
+
+    if ! grep -q "<task>TASK_COMPLETE</task>" "$scratch/$id.out" 2>/dev/null; then
+      log WARNING "Task $id: no completion signal"
+      failed+=("$id")
+      continue
+    fi
+
+    # The scratch tree starts clean, so everything changed there is the worker's
+    (cd "$scratch/$id" && commit_worker_leftovers "$FEATURE_ID: $id ${task_title[$id]}" "") || true
+
+    local head=$(git -C "$scratch/$id" rev-parse HEAD)
+    if [ "$head" = "$base" ]; then
+      log WARNING "Task $id: worker made no commits"
+      failed+=("$id")
+    elif git cherry-pick --allow-empty "$base..$head" >/dev/null 2>&1; then
+      log SUCCESS "Task $id merged"
+      merged+=("$id")
+    else
+      git cherry-pick --abort >/dev/null 2>&1 || true
+      log WARNING "Task $id conflicts with earlier tasks, requeued to run serially"
+      requeued+=("$id")
+    fi
+  done
+
+  for id in "$@"; do
+    git worktree remove --force "$scratch/$id" >/dev/null 2>&1 || true
+  done
+  rm -rf "$scratch"
+  git worktree prune 2>/dev/null || true
+
+  if [ ${#merged[@]} -gt 0 ]; then
+    commit_task_progress "${merged[@]}"
+  fi
+  if [ ${#requeued[@]} -gt 0 ]; then
+    state_set serial_tasks "$(echo $(state_get serial_tasks) ${requeued[*]})"
+  fi
+
+  add_session_log "Implement: merged ${merged[*]:-none}; requeued ${requeued[*]:-none}; failed ${failed[*]:-none}"
+  [ ${#merged[@]} -gt 0 ] || [ ${#requeued[@]} -gt 0 ]
+}
+
+implement_tasks() {
+  local -A task_done=() deps=() task_title=()
+  local order=() id state dep_list text
+
+  while IFS=$'\t' read -r id state dep_list text; do
+    order+=("$id")
+    task_done[$id]=$state
+    deps[$id]=${dep_list#-}
+    task_title[$id]=$text
+  done < <(list_tasks)
+
+  # Tasks requeued after a merge conflict go first, one at a time
+  local rc=0
+  for id in $(state_get serial_tasks); do
+    if [ "${task_done[$id]:-1}" = "0" ]; then
+      run_task_serial "$id" "${task_title[$id]}" || rc=$?
+      finish_implement_if_done
+      return $rc
+    fi
+  done
+
+  local ready=() pending=0 dep blocked
+  for id in "${order[@]}"; do
+    [ "${task_done[$id]}" = "0" ] || continue
+    pending=$((pending + 1))
+    blocked=0
+    for dep in ${deps[$id]//,/ }; do
+      # Unknown IDs do not block
+      [ "${task_done[$dep]:-1}" = "1" ] || blocked=1
+    done
+    if [ $blocked -eq 0 ] && [ ${#ready[@]} -lt $TASK_WORKERS ]; then
+      ready+=("$id")
+    fi
+  done
+
+  if [ $pending -eq 0 ]; then
+    finish_implement_if_done
+    return 0
+  fi
+
+  if [ ${#ready[@]} -eq 0 ]; then
+    log ERROR "No task is ready: check for dependency cycles in $TASKS_FILE"
+    return 1
+  fi
+
+  log INFO "Ready tasks: ${ready[*]} ($pending pending, $TASK_WORKERS workers)"
+
+  if [ ${#ready[@]} -eq 1 ]; then
+    run_task_serial "${ready[0]}" "${task_title[${ready[0]}]}" || rc=$?
+  else
+    run_tasks_parallel "${ready[@]}" || rc=$?
+  fi
+
+  # The last batch was merged: close the phase now, detection moves on to
+  # Verify/PR before implement_tasks would run again
+  finish_implement_if_done
+  return $rc
+}
+
+finish_implement_if_done() {
+  is_implementation_complete || return 0
+  log SUCCESS "All tasks complete!"
+  set_phase_status "Implement" "✅ Complete" "All tasks done"
+}
+
+# ============================================================================
+# VERIFY TEST RUNNER (Phase 5.5)
+# ============================================================================
+normalize_test_names() {
+  # Each test writes to test-results/<name> while the others run, so names
+  # must be non-empty, unique and stay inside that dir: a missing name, "." /
+  # ".." or one with "/" falls back to the script's basename, duplicates get
+  # -2, -3 ...
+  awk -F'\t' -v OFS='\t' '{
+    name = $1
+    if (name ~ /^\.*$/ || name ~ /\//) {
+      name = $2
+      sub(/.*\//, "", name)
+      sub(/\.[^.]*$/, "", name)
+    }
+    gsub(/[^A-Za-z0-9._-]/, "-", name)
+    if (name ~ /^\.*$/) name = "test-" NR
+    base = name
+    n = 1
+    while (name in seen) name = base "-" (++n)
+    seen[name] = 1
+    $1 = name
+    print
+  }'
+}
+
+load_verify_tests() {
+  # One "name<TAB>script<TAB>timeout_ms<TAB>required" line per test
+  if [ -f "$TEST_CONFIG" ] && jq -e '(.tests // []) | length > 0' "$TEST_CONFIG" >/dev/null 2>&1; then
+    jq -r '.tests[] | [
+        (.name // ""),
+        (.script // ""),
+        (.timeout // 300000),
+        (if .required == false then "false" else "true" end)
+      ] | @tsv' "$TEST_CONFIG" | normalize_test_names
+    return
+  fi
+
+  # No usable config: the template scripts, flow required, smoke advisory
+  [ -f "$TEST_DIR/e2e-flow.sh" ] && printf 'e2e-flow\t./e2e-flow.sh\t300000\ttrue\n'
+  [ -f "$TEST_DIR/e2e-smoke.sh" ] && printf 'smoke-tests\t./e2e-smoke.sh\t60000\tfalse\n'
+  return 0
+}
+
+verify_option() {
+  local key=$1
+  local default=$2
+  local value=""
+
+  if [ -f "$TEST_CONFIG" ]; then
+    value=$(jq -r ".options.$key // empty" "$TEST_CONFIG" 2>/dev/null || true)
+  fi
+  echo "${value:-$default}"
+}
+
+run_verify_test() {
+  # Run one test in its own browser session and results dir, enforcing its
+  # timeout and retry policy. Writes "<status> <attempts> <ms> <exit>" to
+  # $TEST_RESULTS_DIR/<name>/result (status: pass, fail or timeout)
+  local name=$1
+  local script=$2
+  local timeout_ms=$3
+  local max_attempts=$4
+  local results="$TEST_RESULTS_DIR/$name"
+  local session="ralph-$FEATURE_ID-$name"
+  local timeout_s=$(( (timeout_ms + 999) / 1000 ))
+
+  rm -rf "$results"
+  mkdir -p "$results"
+
+  local start=$(date +%s%N)
+  local attempt=0
+  local rc=1
+  local status="fail"
+
+  while [ $attempt -lt $max_attempts ]; do
+    attempt=$((attempt + 1))
+    echo "=== $name: attempt $attempt/$max_attempts ($(date +%H:%M:%S)) ===" >> "$results/output.log"
+
+    rc=0
+    SESSION="$session" RESULTS_DIR="$results" \
+      timeout --kill-after=10 "$timeout_s" bash "$TEST_DIR/$script" >> "$results/output.log" 2>&1 || rc=$?
+
+    if [ $rc -eq 0 ]; then
+      status="pass"
+      break
+    elif [ $rc -eq 124 ] || [ $rc -eq 137 ]; then
+      status="timeout"
+      # Killed mid-run: don't leave its browser session behind. A hung test
+      # would most likely hang again, so it is not retried
+      agent-browser --session "$session" close >/dev/null 2>&1 || true
+      break
+    else
+      status="fail"
+    fi
+  done
+
+  local end=$(date +%s%N)
+  echo "$status $attempt $(( (end - start) / 1000000 )) $rc" > "$results/result"
+  record_timing test "$name" "$((start / 1000))" $rc
+}
+
+write_verify_report() {
+  local overall=$1
+  shift
+  local report="$TEST_RESULTS_DIR/test-report.md"
+  local line name script timeout_ms required status attempts duration rc
+
+  {
+    echo "# Test Report: $FEATURE_ID"
+    echo ""
+    echo "**Date:** $(date +"%Y-%m-%d %H:%M:%S")"
+    echo "**Status:** $overall"
+    echo ""
+    echo "## Test Results"
+    echo ""
+    echo "| Test | Required | Result | Attempts | Duration | Timeout |"
+    echo "|------|----------|--------|----------|----------|---------|"
+    for line in "$@"; do
+      IFS=$'\t' read -r name script timeout_ms required <<< "$line"
+      read -r status attempts duration rc < "$TEST_RESULTS_DIR/$name/result"
+      case $status in
+        pass) status="✅ pass" ;;
+        timeout) status="⏱️ timeout" ;;
+        *) status="❌ fail (exit $rc)" ;;
+      esac
+      echo "| $name | $required | $status | $attempts | ${duration}ms | ${timeout_ms}ms |"
+    done
+    echo ""
+    echo "Per-test output, screenshots and logs: \`test-results/<test>/\`"
+    echo ""
+    echo "---"
+    echo "*Generated by Ralph Loop Phase 5.5 (VERIFY)*"
+  } > "$report"
+}
+
 invoke_verify() {
   log INFO "Executing Verify phase (Phase 5.5 - Browser Tests)..."
 
@@ -483,8 +1480,8 @@ invoke_verify() {
   if ! is_verify_needed; then
     log INFO "No frontend changes or test scripts found, skipping VERIFY"
     # Mark as complete (skipped) in status
-    if ! grep -q "| Verify |" "$STATUS_FILE"; then
-      echo "| Verify | ✅ Skipped | $(date +%Y-%m-%d) | No frontend changes |" >> "$STATUS_FILE"
+    if ! grep -q "| Verify | ✅" "$STATUS_FILE"; then
+      set_phase_status "Verify" "✅ Skipped" "No frontend changes"
     fi
     return 0
   fi
@@ -497,9 +1494,7 @@ invoke_verify() {
 
   log INFO "Frontend changes detected, running browser tests..."
 
-  # Create test results directory
-  mkdir -p "$TEST_RESULTS_DIR/screenshots"
-  mkdir -p "$TEST_RESULTS_DIR/videos"
+  mkdir -p "$TEST_RESULTS_DIR"
 
   # Load test configuration
   local base_url="http://localhost:3000"
@@ -508,54 +1503,82 @@ invoke_verify() {
 
   if [ -f "$TEST_CONFIG" ]; then
     log INFO "Loading test configuration..."
-    base_url=$(grep -o '"base_url"[^,}]*' "$TEST_CONFIG" | sed 's/"base_url"[^"]*"\([^"]*\)".*/\1/' || echo "$base_url")
-    test_email=$(grep -o '"email"[^,}]*' "$TEST_CONFIG" | sed 's/"email"[^"]*"\([^"]*\)".*/\1/' | head -1 || echo "$test_email")
+    base_url=$(jq -r '.base_url // empty' "$TEST_CONFIG" 2>/dev/null || true)
+    test_email=$(jq -r '.test_user.email // empty' "$TEST_CONFIG" 2>/dev/null || true)
+    test_password=$(jq -r '.test_user.password // empty' "$TEST_CONFIG" 2>/dev/null || true)
   fi
 
   # Export environment variables for test scripts
   export FEATURE_ID
-  export BASE_URL="$base_url"
-  export TEST_EMAIL="$test_email"
-  export TEST_PASSWORD="$test_password"
-  export SESSION="ralph-$FEATURE_ID"
-  export RESULTS_DIR="$TEST_RESULTS_DIR"
-
-  # Run E2E tests if script exists
-  if [ -f "$TEST_DIR/e2e-flow.sh" ]; then
-    log INFO "Running E2E flow tests..."
-
-    if bash "$TEST_DIR/e2e-flow.sh"; then
-      log SUCCESS "E2E tests passed"
-    else
-      log ERROR "E2E tests failed"
-
-      # Capture failure state
-      log INFO "Capturing failure state..."
-      echo "Test failed on $(date)" > "$TEST_RESULTS_DIR/failure.txt"
+  export BASE_URL="${base_url:-http://localhost:3000}"
+  export TEST_EMAIL="${test_email:-feat-$(echo $FEATURE_ID | tr '[:upper:]' '[:lower:]')-test@example.com}"
+  export TEST_PASSWORD="${test_password:-test-$FEATURE_ID-password}"
+
+  local tests=()
+  mapfile -t tests < <(load_verify_tests)
+  if [ ${#tests[@]} -eq 0 ]; then
+    log WARNING "No tests in test-config.json and no e2e-flow.sh found, skipping browser tests"
+  fi
 
-      # Run security filters on test results
-      log INFO "Running security filters on test results..."
-      bash .memory-system/scripts/security-filters.sh filter-all "$TEST_RESULTS_DIR" || true
+  local max_attempts=1
+  if [ "$(verify_option retry_on_failure false)" = "true" ]; then
+    max_attempts=$((1 + $(verify_option max_retries 0)))
+  fi
+  local max_parallel=$(verify_option max_parallel ${#tests[@]})
+  [ $max_parallel -ge 1 ] || max_parallel=1
+
+  # Independent tests run side by side, each with its own agent-browser
+  # session and results directory
+  log INFO "Running ${#tests[@]} tests (max parallel: $max_parallel, attempts: $max_attempts)..."
+  local line name script timeout_ms required
+  local running=0
+  for line in "${tests[@]}"; do
+    IFS=$'\t' read -r name script timeout_ms required <<< "$line"
+
+    if [ $running -ge $max_parallel ]; then
+      wait -n || true
+      running=$((running - 1))
+    fi
 
-      add_session_log "VERIFY Failed ❌ - Tests failed, see test-results/"
-      return 1
+    log INFO "Starting $name (timeout: ${timeout_ms}ms)"
+    run_verify_test "$name" "$script" "$timeout_ms" "$max_attempts" &
+    running=$((running + 1))
+  done
+  wait
+
+  # Collect results
+  local failed_required=0
+  local status attempts duration rc
+  for line in "${tests[@]}"; do
+    IFS=$'\t' read -r name script timeout_ms required <<< "$line"
+    read -r status attempts duration rc < "$TEST_RESULTS_DIR/$name/result"
+
+    if [ "$status" = "pass" ]; then
+      log SUCCESS "$name passed in ${duration}ms (attempts: $attempts)"
+    elif [ "$required" = "true" ]; then
+      log ERROR "$name: $status after $attempts attempts (exit $rc)"
+      failed_required=$((failed_required + 1))
+    else
+      log WARNING "$name: $status after $attempts attempts (non-blocking)"
     fi
-  else
-    log WARNING "No e2e-flow.sh found, skipping E2E tests"
-  fi
+  done
 
-  # Run smoke tests if script exists (optional, don't fail on error)
-  if [ -f "$TEST_DIR/e2e-smoke.sh" ]; then
-    log INFO "Running smoke tests..."
-    bash "$TEST_DIR/e2e-smoke.sh" || log WARNING "Smoke tests failed (non-blocking)"
-  fi
+  local overall="PASSED"
+  [ $failed_required -eq 0 ] || overall="FAILED"
+  write_verify_report "$overall" "${tests[@]}"
 
   # Run security filters on test results
   log INFO "Running security filters on test results..."
-  bash .memory-system/scripts/security-filters.sh filter-all "$TEST_RESULTS_DIR" || true
+  timed filter filter-all bash "$MEMORY_SYSTEM_DIR/scripts/security-filters.sh" filter-all "$TEST_RESULTS_DIR" || true
+
+  if [ $failed_required -gt 0 ]; then
+    echo "Test failed on $(date)" > "$TEST_RESULTS_DIR/failure.txt"
+    add_session_log "VERIFY Failed ❌ - $failed_required required tests failed, see test-results/"
+    return 1
+  fi
 
   # Update status
-  echo "| Verify | ✅ Complete | $(date +%Y-%m-%d) | Tests passed |" >> "$STATUS_FILE"
+  set_phase_status "Verify" "✅ Complete" "Tests passed"
   add_session_log "VERIFY Complete ✅ - Browser tests passed"
 
   log SUCCESS "VERIFY phase complete"
@@ -607,27 +1630,31 @@ $([ -f "$TEST_RESULTS_DIR/test-report.md" ] && cat "$TEST_RESULTS_DIR/test-repor
 *Created by Ralph Loop*"
 
   gh pr create --title "$pr_title" --body "$pr_body" --base "$base_branch" 2>/dev/null
+  state_set pr_state OPEN
 
   log SUCCESS "PR created"
   add_session_log "PR Created ✅"
 
   # Update status
-  claude -p "Update $STATUS_FILE to mark PR phase as ✅. Emit: <phase>PR_COMPLETE</phase>" $CLAUDE_FLAGS >/dev/null 2>&1
+  set_phase_status "PR" "✅ Complete" "Base: $base_branch"
   return 0
 }
 
 invoke_merge() {
   log INFO "Checking merge status..."
 
-  if is_pr_merged; then
-    log SUCCESS "PR is merged!"
-    add_session_log "Merged ✅"
-    return 0
-  fi
-
-  local state=$(gh pr view --json state 2>/dev/null | jq -r '.state')
+  local state=$(state_get pr_state)
+  [ "$state" = "MERGED" ] || state=$(fetch_pr_state)
 
   case $state in
+    MERGED)
+      log SUCCESS "PR is merged!"
+      if ! grep -q "| Merge |.*Complete" "$STATUS_FILE"; then
+        set_phase_status "Merge" "✅ Complete" "PR merged"
+      fi
+      add_session_log "Merged ✅"
+      return 0
+      ;;
     OPEN) log WARNING "PR is open, waiting for approval..."; return 2 ;;
     CLOSED) log ERROR "PR was closed without merging"; return 1 ;;
     *) log INFO "Merge status: $state"; return 2 ;;
@@ -648,7 +1675,7 @@ Create/update $WRAPUP_FILE.
 Update $STATUS_FILE to mark complete.
 
 When complete, emit: <phase>WRAPUP_COMPLETE</phase>
-Then emit: <phase>FEATURE_COMPLETE</phase>"
+Then emit: <phase>FEATURE_COMPLETE</phase>$(memory_context wrapup lessons learned)"
 
   echo "[→] Executing Claude..." >&2
   local output=$(claude -p "$prompt" $CLAUDE_FLAGS 2>&1)
@@ -688,9 +1715,257 @@ invoke_phase() {
   esac
 }
 
+# ============================================================================
+# WAITING FOR EXTERNAL ACTION
+# ============================================================================
+wait_for_external() {
+  # Sleep with exponential backoff (WAIT_MIN .. WAIT_MAX), but return as soon
+  # as a wake trigger shows up: `ralph-feature.sh --wake [FEAT-XXX]` or
+  # SIGUSR1 to this loop's PID
+  if [ $WAIT_DELAY -eq 0 ]; then
+    WAIT_DELAY=$WAIT_MIN
+  else
+    WAIT_DELAY=$((WAIT_DELAY * 2))
+    [ $WAIT_DELAY -gt $WAIT_MAX ] && WAIT_DELAY=$WAIT_MAX
+  fi
+
+  local marker="$RALPH_RUN_DIR/waiting/$FEATURE_ID"
+  local feature_wake="$RALPH_RUN_DIR/wake-$FEATURE_ID"
+  local global_wake="$RALPH_RUN_DIR/wake"
+  mkdir -p "$RALPH_RUN_DIR/waiting"
+  echo $$ > "$marker"
+
+  log INFO "Next check in ${WAIT_DELAY}s (resume now: $0 --wake $FEATURE_ID, or kill -USR1 $$)"
+
+  WAKE_REQUESTED=0
+  local waited=0
+  local start=$(now_us)
+  while [ $waited -lt $WAIT_DELAY ]; do
+    if [ $WAKE_REQUESTED -eq 1 ] || [ -f "$feature_wake" ] || [ "$global_wake" -nt "$marker" ]; then
+      log INFO "Wake-up trigger received, checking now"
+      rm -f "$feature_wake"
+      # Something changed: skip the shared snapshot and restart the backoff
+      rm -f "$RALPH_RUN_DIR/pr-states.tsv"
+      WAIT_DELAY=0
+      break
+    fi
+    sleep 1
+    waited=$((waited + 1))
+  done
+
+  rm -f "$marker"
+  record_timing wait backoff "$start" 0
+}
+
+wake_loops() {
+  mkdir -p "$RALPH_RUN_DIR"
+
+  if [ -n "$WAKE_TARGET" ]; then
+    touch "$RALPH_RUN_DIR/wake-$WAKE_TARGET"
+    log INFO "Wake-up sent to $WAKE_TARGET"
+  else
+    touch "$RALPH_RUN_DIR/wake"
+    log INFO "Wake-up sent to all waiting loops"
+  fi
+}
+
+# ============================================================================
+# SCHEDULER (--all)
+# ============================================================================
+list_pending_features() {
+  # Feature IDs in _index.md that are not Complete and have a feature folder
+  [ -f "$INDEX_FILE" ] || return 0
+
+  grep -E '^\|\s*FEAT-' "$INDEX_FILE" | grep -v "🟢" | \
+    awk -F'|' '{ gsub(/ /, "", $2); print $2 }' | \
+    while read -r id; do
+      [ -d "docs/features/$id" ] && echo "$id"
+    done
+}
+
+update_index_row() {
+  local id=$1
+  local status=$2
+  local phase=$3
+  local progress=$4
+  local tmp="$INDEX_FILE.tmp.$$"
+
+  # Columns: | ID | Feature | Status | Phase | Progress | Priority | Updated |
+  awk -F'|' -v OFS='|' -v id="$id" -v st=" $status " -v ph=" $phase " \
+      -v pg=" $progress " -v dt=" $(date +%Y-%m-%d) " '
+    { key = $2; gsub(/ /, "", key) }
+    key == id && NF >= 9 { $4 = st; $5 = ph; $6 = pg; $8 = dt }
+    { print }
+  ' "$INDEX_FILE" > "$tmp" && mv "$tmp" "$INDEX_FILE"
+}
+
+sync_index_row() {
+  local id=$1
+  local worktree=$2
+  local status_file="$RALPH_RUN_DIR/status/$id"
+
+  [ -f "$status_file" ] || return 0
+
+  local phase state
+  IFS=$'\t' read -r phase state < "$status_file"
+
+  local label
+  case $state in
+    running) label="🟡 In Progress" ;;
+    review) label="🔵 In Review" ;;
+    complete) label="🟢 Complete" ;;
+    paused|failed) label="🔴 Blocked" ;;
+    *) label="🟡 In Progress" ;;
+  esac
+
+  local progress="-"
+  local tasks="$worktree/docs/features/$id/tasks.md"
+  if [ -f "$tasks" ]; then
+    local total=$(grep -E '^-\s*\[' "$tasks" | wc -l)
+    local complete=$(grep -E '^-\s*\[x\]' "$tasks" | wc -l)
+    [ $total -gt 0 ] && progress="$complete/$total"
+  fi
+
+  update_index_row "$id" "$label" "$phase" "$progress"
+}
+
+prepare_worktree() {
+  local id=$1
+  local root=$(git rev-parse --show-toplevel)
+  local path="$(dirname "$root")/$(basename "$root")-$id-loop"
+  local branch="feat/$(echo $id | sed -E 's/^(FEAT-[0-9]+).*/\1/')"
+
+  if [ ! -d "$path" ]; then
+    if git show-ref --verify --quiet "refs/heads/$branch"; then
+      git worktree add "$path" "$branch" >&2 || return 1
+    else
+      # Detached at the base tip; the Branch phase creates the feature branch
+      git worktree add --detach "$path" "$(base_branch_ref)" >&2 || return 1
+    fi
+  fi
+
+  # A feature folder that is not committed yet is copied in; the Branch phase
+  # carries it onto the feature branch, where the loop commits it after each
+  # phase (commit_feature_folder)
+  if [ ! -d "$path/docs/features/$id" ]; then
+    mkdir -p "$path/docs/features"
+    cp -R "docs/features/$id" "$path/docs/features/"
+  fi
+
+  echo "$path"
+}
+
+run_scheduler() {
+  cd "$(git rev-parse --show-toplevel)"
+
+  local queue=($(list_pending_features))
+  if [ ${#queue[@]} -eq 0 ]; then
+    log INFO "No pending features in $INDEX_FILE"
+    return 0
+  fi
+
+  export RALPH_SCHEDULED=1
+  export RALPH_RUN_DIR
+  export RALPH_MAX_CLAUDE="${RALPH_MAX_CLAUDE:-$MAX_PARALLEL}"
+
+  # Uncommitted tooling is used from here instead of being copied into the
+  # worktrees, where a `git add -A` would commit it
+  if [ -d ".memory-system" ] && [ -z "${RALPH_MEMORY_SYSTEM:-}" ] && \
+      ! git cat-file -e "$(base_branch_ref):.memory-system" 2>/dev/null; then
+    export RALPH_MEMORY_SYSTEM="$(pwd)/.memory-system"
+  fi
+
+  # New worktrees start at origin/<base>; make that the current tip, as the
+  # pull in single-feature mode does
+  if git remote get-url origin >/dev/null 2>&1; then
+    git fetch origin 2>/dev/null || log WARNING "git fetch origin failed, branching from the last fetched base"
+  fi
+
+  rm -rf "$RALPH_RUN_DIR/status"
+  mkdir -p "$RALPH_RUN_DIR/status" "$RALPH_RUN_DIR/claude-slots" "$RALPH_RUN_DIR/logs"
+
+  log INFO "Scheduling ${#queue[@]} features: ${queue[*]}"
+  log INFO "Max parallel loops: $MAX_PARALLEL, max concurrent claude calls: $RALPH_MAX_CLAUDE"
+
+  local -A running=()
+  local -A worktrees=()
+  local next=0
+  local failed=0
+
+  trap 'kill "${running[@]}" 2>/dev/null; exit 130' INT TERM
+
+  while [ $next -lt ${#queue[@]} ] || [ ${#running[@]} -gt 0 ]; do
+    # Fill free loop slots from the queue
+    while [ ${#running[@]} -lt $MAX_PARALLEL ] && [ $next -lt ${#queue[@]} ]; do
+      local id=${queue[$next]}
+      next=$((next + 1))
+
+      local worktree
+      if ! worktree=$(prepare_worktree "$id"); then
+        log ERROR "Could not create worktree for $id"
+        update_index_row "$id" "🔴 Blocked" "worktree" "-"
+        failed=$((failed + 1))
+        continue
+      fi
+
+      # Logs stay out of the worktree so they are never committed
+      (cd "$worktree" && exec bash "$SCRIPT_PATH" "$id" "$MAX_ITERATIONS") \
+        > "$RALPH_RUN_DIR/logs/$id.log" 2>&1 &
+      running[$id]=$!
+      worktrees[$id]=$worktree
+
+      log INFO "Started $id (pid ${running[$id]}) in $worktree"
+      update_index_row "$id" "🟡 In Progress" "starting" "-"
+    done
+
+    sleep "${RALPH_SCHEDULER_POLL:-5}"
+
+    # Publish progress to _index.md and reap finished loops
+    local id
+    for id in "${!running[@]}"; do
+      sync_index_row "$id" "${worktrees[$id]}"
+
+      if ! kill -0 "${running[$id]}" 2>/dev/null; then
+        local rc=0
+        wait "${running[$id]}" || rc=$?
+
+        if [ $rc -eq 0 ]; then
+          log SUCCESS "$id loop finished (log: $RALPH_RUN_DIR/logs/$id.log)"
+        else
+          log ERROR "$id loop exited with code $rc (log: $RALPH_RUN_DIR/logs/$id.log)"
+          failed=$((failed + 1))
+        fi
+        unset "running[$id]"
+      fi
+    done
+  done
+
+  trap - INT TERM
+  log INFO "All scheduled features processed ($failed failed)"
+  [ $failed -eq 0 ]
+}
+
 # ============================================================================
 # MAIN LOOP
 # ============================================================================
+if [ "$RUN_MODE" = "all" ]; then
+  run_scheduler
+  exit $?
+fi
+
+if [ "$RUN_MODE" = "wake" ]; then
+  wake_loops
+  exit 0
+fi
+
+if [ "$RUN_MODE" = "render" ]; then
+  render_journal
+  log SUCCESS "Rendered $SESSION_LOG and $STATUS_FILE from $JOURNAL_FILE"
+  exit 0
+fi
+
+trap 'WAKE_REQUESTED=1' USR1
+
 echo "DEBUG: Entering main()"
 echo "DEBUG: FEATURE_ID=$FEATURE_ID"
 echo "DEBUG: FEATURE_DIR=$FEATURE_DIR"
@@ -702,6 +1977,9 @@ if [ ! -d "$FEATURE_DIR" ]; then
   exit 1
 fi
 
+# Session log view is rebuilt from the journal once, however the loop ends
+trap render_journal EXIT
+
 if is_branch_created; then
   git checkout "$BRANCH_NAME" 2>/dev/null
 fi
@@ -709,13 +1987,25 @@ fi
 while [ $ITERATION -lt $MAX_ITERATIONS ]; do
   ITERATION=$((ITERATION + 1))
   echo "DEBUG: Iteration $ITERATION"
+  iteration_start=$(now_us)
 
   phase=$(get_current_phase)
+  record_timing detect "$phase" "$iteration_start" 0
   echo "DEBUG: Phase detected: $phase"
   log INFO "Detected phase: $phase"
 
-  invoke_phase "$phase"
-  result=$?
+  report_loop_state "$phase" running
+
+  result=0
+  phase_start=$(now_us)
+  invoke_phase "$phase" || result=$?
+  record_timing phase "$phase" "$phase_start" "$result"
+  record_phase_result "$phase" "$result"
+  if [ $result -eq 0 ] || [ $result -eq 100 ]; then
+    commit_feature_folder "$phase"
+  fi
+  record_timing iteration "$phase" "$iteration_start" "$result"
+  [ $result -eq 2 ] || WAIT_DELAY=0
 
   case $result in
     0)
@@ -731,30 +2021,35 @@ while [ $ITERATION -lt $MAX_ITERATIONS ]; do
       if [ $CONSECUTIVE_FAILURES -ge $MAX_FAILURES ]; then
         log ERROR "Too many consecutive failures. Pausing."
         add_session_log "[WARN] Paused after $CONSECUTIVE_FAILURES failures"
+        report_loop_state "$phase" failed
         exit 1
       fi
       ;;
     2)
       # Waiting
       log INFO "Waiting for external action..."
-      sleep 60
+      [ "$phase" = "merge" ] && report_loop_state "$phase" review
+      wait_for_external
       ;;
     3)
       # Human input needed
       log WARNING "Human input required. Pausing loop."
       add_session_log "[PAUSED] Human input needed in $phase phase"
+      report_loop_state "$phase" paused
       exit 0
       ;;
     100)
       # Complete
       log SUCCESS "[COMPLETE] Feature $FEATURE_ID is complete!"
+      report_loop_state complete complete
       exit 0
       ;;
   esac
 
-  sleep 2
+  sleep "$ITERATION_PAUSE"
 done
 
 log WARNING "Max iterations ($MAX_ITERATIONS) reached"
 add_session_log "[WARN] Max iterations reached at $CURRENT_PHASE phase"
+report_loop_state "$CURRENT_PHASE" stopped
 exit 0